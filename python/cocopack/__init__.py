@@ -1,29 +1,59 @@
 __version__ = "0.1.0"
 
-from . import notebook
-
+import sys, importlib
 from os import environ
 
-if not environ.get('ZERO_STYLE', False):
-    notebook.stylizer.auto_style()
-    
-from .figure_ops import (
-    slides_to_images,
-    convert_to_pdf,
-    convert_images_to_pdf,
-    mogrify_images_to_pdf,
-)
+# submodules and re-exported functions are loaded lazily (PEP 562),
+# so `import cocopack` doesn't pay for IPython, PIL, etc. up front
+
+_SUBMODULES = {
+    'notebook': 'notebook',
+    'figure_ops': 'figure_ops',
+    'shellpack': 'shellpack',
+    'shell': 'shellpack',
+    'convert': 'convert',
+    'overleaf': 'overleaf',
+    'pacman': 'pacman',
+    'path_ops': 'path_ops',
+}
+
+_LAZY_EXPORTS = {
+    # from figure_ops
+    'slides_to_images': 'figure_ops',
+    'convert_to_pdf': 'figure_ops',
+    'convert_images_to_pdf': 'figure_ops',
+    'mogrify_images_to_pdf': 'figure_ops',
 
-from .notebook import (
-    set_autoreload,
-)
+    # from notebook
+    'set_autoreload': 'notebook',
+
+    # from shellpack
+    'shell_commands': 'shellpack',
+    'install_shell_scripts': 'shellpack',
+}
 
-from .shellpack import (
-    shell_commands,
-    install_shell_scripts,
-)
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f'.{_SUBMODULES[name]}', __name__)
 
-from . import shellpack as shell
+    elif name in _LAZY_EXPORTS:
+        module = importlib.import_module(f'.{_LAZY_EXPORTS[name]}', __name__)
+        module = getattr(module, name)
+
+    else: # not a lazy attribute
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    globals()[name] = module # cache for subsequent lookups
+    return module
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_LAZY_EXPORTS))
+
+# auto-styling only matters inside a running kernel, in which case
+# IPython is already loaded and importing the stylizer is cheap
+if not environ.get('ZERO_STYLE', False) and 'ipykernel' in sys.modules:
+    from .notebook import stylizer as _stylizer
+    _stylizer.auto_style()
 
 __all__ = [
     # from figure_ops
@@ -31,11 +61,11 @@ __all__ = [
     'convert_to_pdf',
     'convert_images_to_pdf',
     'mogrify_images_to_pdf',
-    
+
     # from notebook
     'set_autoreload',
-    
+
     # from shellpack
     'shell_commands',
     'install_shell_scripts',
-]
\ No newline at end of file
+]
@@ -3,7 +3,7 @@ import os
 from copy import copy
 from PIL import Image
 
-__all__ = ['convert_image']
+__all__ = ['convert_image', 'downscale_image']
 
 # Input / Image Conversion ----------------------------------------
 
@@ -61,4 +61,43 @@ def convert_image(source_path, target_format, **kwargs):
     if kwargs.pop('remove_original', True):
         os.remove(source_path)
 
-    return target_path # return the new path
\ No newline at end of file
+    return target_path # return the new path
+
+# Output / Image Downscaling --------------------------------------
+
+def downscale_image(source_path, max_width=None, target_path=None, **kwargs):
+    """Downscale (if wider than max_width) and recompress an image, keeping its format.
+    
+    Args:
+        source_path (str): Path to the source image file.
+        max_width (int, optional): Maximum width in pixels; wider images are resized
+            (preserving aspect ratio). Defaults to None (no resizing).
+        target_path (str, optional): Where to save the result. Defaults to source_path.
+        **kwargs: Additional keyword arguments.
+            quality (int): JPEG / WEBP quality. Defaults to 85.
+            
+    Returns:
+        tuple: Original (width, height) and new (width, height) of the image.
+    """
+    quality = kwargs.pop('quality', 85)
+    
+    if target_path is None:
+        target_path = source_path
+    
+    with Image.open(source_path) as img:
+        img.load() # read fully before overwriting the source
+        img_format, original_size = img.format, img.size
+    
+    if max_width is not None and img.width > max_width:
+        height = max(1, round(img.height * max_width / img.width))
+        img = img.resize((int(max_width), height), Image.LANCZOS)
+        
+    save_kwargs = {'optimize': True}
+    if img_format in ['JPEG', 'WEBP']:
+        save_kwargs['quality'] = quality
+        if img.mode not in ('RGB', 'L', 'CMYK'):
+            img = _make_opaque(img)
+    
+    img.save(target_path, img_format, **save_kwargs)
+    
+    return original_size, img.size
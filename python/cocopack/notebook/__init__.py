@@ -1,6 +1,22 @@
-from . import stylizer
-from . import magics
+import importlib
 
-from .magics import set_autoreload
+_SUBMODULES = ('stylizer', 'magics')
 
-__all__ = ['stylizer', 'magics', 'set_autoreload']
\ No newline at end of file
+def __getattr__(name):
+    # load stylizer / magics (and thus IPython) only on first use
+    if name in _SUBMODULES:
+        module = importlib.import_module(f'.{name}', __name__)
+
+    elif name == 'set_autoreload':
+        module = importlib.import_module('.magics', __name__).set_autoreload
+
+    else: # not a lazy attribute
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    globals()[name] = module
+    return module
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+__all__ = ['stylizer', 'magics', 'set_autoreload']
@@ -1,4 +1,4 @@
-import os, io, re, shutil
+import os, io, re, sys, json, time, shutil, tempfile
 import bibtexparser # 1.x
 
 from copy import copy
@@ -7,15 +7,22 @@ from pathlib import Path
 from PIL import Image
 from tqdm.auto import tqdm
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 __all__ = [
     'set_overleaf_root',
     'get_overleaf_root', 
     'get_overleaf_path', 
     'list_overleaf_projects',
+    'index_overleaf_projects',
     'gather_submission', 
+    'gather_submissions', 
+    'watch_submission', 
+    'fit_submission_size', 
     'find_tex_inputs', 
     'find_all_inputs', 
+    'build_reference_index', 
+    'find_unused_assets', 
     'stitch_tex_files', 
     'get_bibtex_dir', 
     'get_bibtex_files', 
@@ -104,6 +111,19 @@ def get_overleaf_path(project_name, overleaf_root=None):
     overleaf_root = get_overleaf_root(overleaf_root)
     return os.path.join(overleaf_root, project_name)
 
+def _scan_overleaf_root(overleaf_root):
+    # single directory read; scandir entries carry file type + stat results
+    projects = []
+    with os.scandir(overleaf_root) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue # skip hidden entries (as glob does)
+            
+            if entry.is_dir():
+                projects.append((entry.stat().st_mtime, entry.name))
+                
+    return projects # list of (mtime, project_name)
+
 def list_overleaf_projects(overleaf_root=None, exclusions=[], sort_by_date=True, **kwargs):
     """List all Overleaf projects in the root directory.
     
@@ -115,17 +135,23 @@ def list_overleaf_projects(overleaf_root=None, exclusions=[], sort_by_date=True,
         sort_by_date (bool, optional): Whether to sort projects by modification date. Defaults to True.
         **kwargs: Additional keyword arguments.
             verbose (bool): If True, prints projects with their last modified dates. Defaults to False.
+            use_index (bool): If True, read project dates from the cached project index
+                (see index_overleaf_projects) instead of scanning the root. Defaults to False.
+            cache_file, refresh: With use_index, passed to index_overleaf_projects.
     
     Returns:
         list: List of Overleaf project names.
     """
     overleaf_root = get_overleaf_root(overleaf_root) # fetch root
     
-    overleaf_paths = [(os.path.getmtime(path), path) for path
-                      in glob(os.path.join(overleaf_root, '*'))]
-    
-    project_list = [(date, os.path.basename(path)) for date, path 
-                    in overleaf_paths if os.path.isdir(path)]
+    if kwargs.pop('use_index', False):
+        index = index_overleaf_projects(overleaf_root, kwargs.pop('cache_file', None),
+                                        kwargs.pop('refresh', False))
+        project_list = [(info['mtime'], project) 
+                        for project, info in index.items()]
+        
+    else: # one scandir pass over the root
+        project_list = _scan_overleaf_root(overleaf_root)
     
     if exclusions is not None and len(exclusions) > 0:
         project_list = [(date, project) for date, project in project_list 
@@ -159,8 +185,184 @@ def get_overleaf_projects(overleaf_root=None, exclusions=[], sort_by_date=True,
     """
     return list_overleaf_projects(overleaf_root, exclusions, sort_by_date, **kwargs)
 
+# Overleaf Project Index -------------------------------------------------
+
+_OVERLEAF_INDEX = {} # in-memory cache: {overleaf_root: {project: info}}
+
+def _find_main_tex(project_path):
+    # prefer main.tex; else first top-level .tex with a \documentclass
+    tex_files = []
+    with os.scandir(project_path) as entries:
+        for entry in entries:
+            if entry.name.endswith('.tex') and entry.is_file():
+                tex_files.append(entry.name)
+                
+    if 'main.tex' in tex_files:
+        return 'main.tex'
+    
+    for tex_file in sorted(tex_files):
+        try: # only the preamble needs to be read
+            with open(os.path.join(project_path, tex_file), 'r', errors='ignore') as file:
+                if '\\documentclass' in file.read(4096):
+                    return tex_file
+        except OSError:
+            continue # unreadable file; skip
+                
+    return None # no main file found
+
+def _get_tree_size(dir_path):
+    total_size = 0 # in bytes
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    total_size += _get_tree_size(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue # entry vanished or unreadable
+            
+    return total_size
+
+def _get_tree_mtime(dir_path):
+    # latest mtime of dir_path and its subfolders (only folders are stat-ed)
+    tree_mtime = os.stat(dir_path).st_mtime
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    tree_mtime = max(tree_mtime, _get_tree_mtime(entry.path))
+            except OSError:
+                continue # entry vanished or unreadable
+            
+    return tree_mtime
+
+def _load_overleaf_index(root_key, cache_file=None):
+    index = _OVERLEAF_INDEX.get(root_key, None)
+    
+    if index is None and cache_file is not None and os.path.exists(cache_file):
+        with open(cache_file, 'r') as file:
+            index = json.load(file).get(root_key, None)
+            
+    if index is None or 'projects' not in index:
+        return None # no index yet (or one in an older format)
+    
+    return index
+
+def _save_overleaf_index(root_key, index, cache_file=None):
+    _OVERLEAF_INDEX[root_key] = index
+    
+    if cache_file is not None: # persist the index for later sessions
+        cached_roots = {}
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r') as file:
+                cached_roots = json.load(file)
+                
+        cached_roots[root_key] = index
+        
+        if os.path.dirname(cache_file):
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            
+        with open(cache_file, 'w') as file:
+            json.dump(cached_roots, file, indent=4)
+
+def index_overleaf_projects(overleaf_root=None, cache_file=None, refresh=False, details=False, **kwargs):
+    """Build (or incrementally refresh) a metadata index of Overleaf projects.
+    
+    The index is cached in memory per root and, optionally, persisted to a JSON
+    file, so repeated listings don't have to scan a slow (e.g. network-mounted)
+    sync folder again: while the root's modification time is unchanged, the
+    cached listing is returned after a single stat of the root. Otherwise the
+    root is read once with os.scandir, keeping the entries of unchanged projects.
+    
+    Project details (main .tex file and size) are computed lazily, only when
+    details=True, and are cached until a folder anywhere in the project changes.
+    
+    Args:
+        overleaf_root (str, optional): Path to the Overleaf root directory.
+            If None, gets it from get_overleaf_root(). Defaults to None.
+        cache_file (str, optional): Path to a JSON file used to persist the index
+            between sessions. Defaults to None (in-memory cache only).
+        refresh (bool, optional): If True, re-scan the root and every project 
+            regardless of modification times. Defaults to False.
+        details (bool, optional): If True, also fill in each project's main file and
+            size. Defaults to False.
+        **kwargs: Additional keyword arguments.
+            verbose (bool): If True, print the projects being (re-)indexed. Defaults to False.
+    
+    Returns:
+        dict: Mapping of project names to dictionaries with key 'mtime' and, once
+            details have been computed, 'main_file' (None if not found), 'size' 
+            (in bytes), and 'tree_mtime' (latest folder mtime in the project).
+    
+    Note:
+        The root's mtime changes when projects are added, removed or renamed, not
+        when a project's contents change; project dates in the listing are those 
+        of the last root scan (use refresh=True to update them). Similarly, details
+        are revalidated by folder mtimes, which change when files are created,
+        deleted or replaced (as sync clients and most editors do), but not when a
+        file is rewritten in place.
+    """
+    overleaf_root = get_overleaf_root(overleaf_root) # fetch root
+    root_key = os.path.abspath(overleaf_root)
+    verbose = kwargs.pop('verbose', False)
+    
+    root_mtime = os.stat(overleaf_root).st_mtime
+    index = _load_overleaf_index(root_key, cache_file)
+    
+    if index is None or refresh or index['mtime'] != root_mtime:
+        cached_projects = {} if index is None else index['projects']
+        
+        projects = {} # drops projects that no longer exist
+        for mtime, project in _scan_overleaf_root(overleaf_root):
+            cached_info = cached_projects.get(project, None)
+            
+            if not refresh and cached_info is not None and cached_info['mtime'] == mtime:
+                projects[project] = cached_info # unchanged since last scan
+            else: # details (if any) are revalidated below
+                projects[project] = {**(cached_info or {}), 'mtime': mtime}
+                
+        index = {'mtime': root_mtime, 'projects': projects}
+        
+    elif not details: # unchanged root: serve the cached listing
+        _OVERLEAF_INDEX[root_key] = index
+        return index['projects']
+        
+    if details:
+        for project, info in index['projects'].items():
+            project_path = os.path.join(overleaf_root, project)
+            tree_mtime = _get_tree_mtime(project_path)
+            
+            if not refresh and info.get('tree_mtime', None) == tree_mtime:
+                continue # nothing in the project changed
+            
+            if verbose:
+                print(f'Indexing {project}...')
+                
+            info.update({'main_file': _find_main_tex(project_path),
+                         'size': _get_tree_size(project_path),
+                         'tree_mtime': tree_mtime})
+            
+    _save_overleaf_index(root_key, index, cache_file)
+        
+    return index['projects']
+
 # Gather Submission Materials ---------------------------------------------
 
+def _stitch_gathered_bibtex(project_path, output_dir, verbose=False):
+    # stitch the .bib files gathered in output_dir into references.bib (removing them);
+    # output_dir already includes project_path where needed, so nothing is prepended
+    output_file = os.path.abspath(os.path.join(output_dir, 'references.bib'))
+    bibtex_files = [os.path.abspath(file_path) for file_path in 
+                    sorted(glob(os.path.join(output_dir, '*.bib')))
+                    if os.path.basename(file_path) != 'references.bib']
+    
+    if verbose: 
+        print(f'Stitching {len(bibtex_files)} to {output_file}...')
+    
+    stitch_bibtex_files(project_path, bibtex_files, output_file,
+                        cleanup=True, dry_run=False, prepend_project=False)
+
 def gather_submission(project_path, main_file, support_files, output_dir, **kwargs):
     """Gather LaTeX project files for submission, stitching files together and organizing references.
     
@@ -178,12 +380,19 @@ def gather_submission(project_path, main_file, support_files, output_dir, **kwar
             verbose (bool): If True, print detailed information. Defaults to False.
             stitch_bibtex (bool): If True, stitch bibtex files together. Defaults to True.
             exclude_comments (bool): If True, exclude commented lines when updating references. Defaults to True.
+            size_budget (Union[int, str]): If provided, downscale raster figures until the
+                output fits this size (e.g. '10MB'); see fit_submission_size. Defaults to None.
+            stats (dict): If provided, updated in place with per-stage timings (seconds),
+                files copied, bytes copied, images converted, and the mapping of
+                original to gathered file paths. Defaults to None.
     """
+    stats = kwargs.pop('stats', None)
+    size_budget = kwargs.pop('size_budget', None)
+    timings = {} # seconds per stage
+    
     if kwargs.pop('prepend_project', False):
         output_dir = os.path.join(project_path, output_dir)
         
-    output_root = Path(output_dir).parent
-    
     # Ensure the output directory exists
     if not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
@@ -197,19 +406,22 @@ def gather_submission(project_path, main_file, support_files, output_dir, **kwar
     
     new_main = kwargs.pop('main_name', 'manuscript.tex')
     
-    # Stitch (but don't yet write) main file .tex content
-    content = stitch_tex_files(project_path, main_file, 
-                                content_only=True, **kwargs)
-
-    original_to_new = {} # file_path mappings
-    
     #optional renaming schema for materials
     new_names = kwargs.pop('new_names', {})
     
     image_extensions = Image.registered_extensions()
     image_format = kwargs.pop('image_format', None)
+    
+    # Stitch (but don't yet write) main file .tex content
+    stage_start = time.perf_counter()
+    content = stitch_tex_files(project_path, main_file, 
+                                content_only=True, **kwargs)
+    timings['stitch'] = time.perf_counter() - stage_start
+
+    original_to_new = {} # file_path mappings
 
     # Copy files to the output directory, flattening the structure
+    stage_start, bytes_copied = time.perf_counter(), 0
     for file_path in support_files:
         original_dir, filename = os.path.split(file_path)
         filename = new_names.get(filename, filename)
@@ -230,10 +442,14 @@ def gather_submission(project_path, main_file, support_files, output_dir, **kwar
     
         shutil.copyfile(src_path, new_path)
         original_to_new[file_path] = new_path
+        bytes_copied += os.path.getsize(new_path)
+        
+    timings['copy'] = time.perf_counter() - stage_start
         
     image_files = [file_path for file_path in original_to_new if 
                    os.path.splitext(file_path)[1] in image_extensions]
     
+    stage_start, images_converted = time.perf_counter(), 0
     if image_format is not None: # convert images to target format
         description = f'Converting Images to {image_format.upper()}'
         
@@ -247,10 +463,49 @@ def gather_submission(project_path, main_file, support_files, output_dir, **kwar
             new_path = new_path.replace(src_ext, f'.{image_format}')
             
             original_to_new[file_path] = new_path # update the mapping
+            images_converted += 1
+            
+    timings['convert'] = time.perf_counter() - stage_start
+            
+    # Update references in the content
+    stage_start = time.perf_counter()
+    content, last_bibliography = _update_references(content, original_to_new, **kwargs)
+                
+    timings['references'] = time.perf_counter() - stage_start
+            
+    stage_start = time.perf_counter()
+    if kwargs.pop('stitch_bibtex', True):
+        _stitch_gathered_bibtex(project_path, output_dir, kwargs.get('verbose', False))
+        
+        new_bibliography = "\\bibliography{references}"
+        content = content.replace(last_bibliography, new_bibliography)
+        
+        if kwargs.get('verbose', True):
+            print(f"Updating {last_bibliography} to {new_bibliography}")
             
+    timings['bibtex'] = time.perf_counter() - stage_start
+                
+    write_content(os.path.join(output_dir, new_main), content)
+    
+    size_report = None
+    if size_budget is not None: # downscale figures to fit
+        stage_start = time.perf_counter()
+        size_report = fit_submission_size(output_dir, size_budget, new_main,
+                                          verbose=kwargs.get('verbose', True))
+        timings['size_budget'] = time.perf_counter() - stage_start
+    
+    if stats is not None: # report back to the caller
+        stats.update({'stages': timings,
+                      'size_report': size_report,
+                      'file_map': original_to_new,
+                      'files_copied': len(original_to_new),
+                      'bytes_copied': bytes_copied,
+                      'images_converted': images_converted})
+
+def _update_references(content, original_to_new, **kwargs):
+    # point references at the gathered (flattened, renamed) files
     last_bibliography = r'\\bibliography\{references\}'
                 
-    # Update references in the content
     for old_path, new_path in original_to_new.items():
         new_path = os.path.basename(new_path) # relative
         
@@ -284,24 +539,531 @@ def gather_submission(project_path, main_file, support_files, output_dir, **kwar
             
             if 'bibliography' in update:
                 last_bibliography = copy(update)
+                
+    return content, last_bibliography
+
+# Fit Submission Size Budget ----------------------------------------------
+
+_RASTER_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.webp', '.gif']
+
+_LENGTH_UNITS = {'in': 1.0, 'cm': 1 / 2.54, 'mm': 1 / 25.4, 
+                 'pt': 1 / 72.27, 'bp': 1 / 72, 'pc': 12 / 72.27}
+
+_TEX_NUMBER = r'(\d+(?:\.\d*)?|\.\d+)' # at least one digit
+
+def _parse_tex_length(length, text_width):
+    # length in inches, e.g. '3in', '0.5\linewidth', '\textwidth'
+    relative = re.fullmatch(r'\s*' + _TEX_NUMBER + 
+                            r'?\s*\\(linewidth|textwidth|columnwidth|hsize)\s*', length)
+    if relative is not None:
+        return float(relative.group(1) or 1) * text_width
+    
+    absolute = re.fullmatch(r'\s*' + _TEX_NUMBER + r'\s*(in|cm|mm|pt|bp|pc)\s*', length)
+    if absolute is not None:
+        return float(absolute.group(1)) * _LENGTH_UNITS[absolute.group(2)]
+    
+    raise ValueError(f"Unparsable TeX length: {length!r} (expected e.g. '6.5in' or '0.5\\linewidth')")
+
+def _get_rendered_widths(content, text_width):
+    # map referenced image stems to their (widest) rendered width in inches
+    widths = {}
+    regex = r'\\includegraphics\*?\s*(?:\[([^\]]*)\])?\s*\{([^}]*)\}'
+    for options, reference in re.findall(regex, content):
+        width = None
+        for option in options.split(','):
+            key, _, value = option.partition('=')
+            if key.strip() == 'width':
+                try:
+                    width = _parse_tex_length(value, text_width)
+                except ValueError: # e.g. \dimexpr; fall back to the text width
+                    width = None
+                
+        stem = os.path.splitext(os.path.basename(reference.strip()))[0]
+        widths[stem] = max(widths.get(stem, 0), width or text_width)
+        
+    return widths
+
+def _get_folder_size(dir_path):
+    return sum(entry.stat().st_size for entry in os.scandir(dir_path) if entry.is_file())
+
+def fit_submission_size(output_dir, max_bytes, main_file='manuscript.tex', 
+                        dpi=300, min_dpi=100, max_workers=None, **kwargs):
+    """Downscale and recompress raster figures until a gathered submission fits a size budget.
+    
+    Each raster figure is resized to the pixel width it needs at the target DPI,
+    given its rendered width in the manuscript (from \includegraphics[width=...],
+    defaulting to the text width), and recompressed in parallel. If the folder is
+    still over budget, the DPI (and JPEG quality) are lowered and the figures are
+    reprocessed from the originals, until the budget is met or min_dpi is reached.
+    
+    Args:
+        output_dir (str): Directory containing the gathered submission.
+        max_bytes (Union[int, str]): Size budget in bytes, or a string like '10MB'.
+        main_file (str, optional): Name of the gathered main .tex file. Defaults to 'manuscript.tex'.
+        dpi (int, optional): Initial target resolution. Defaults to 300.
+        min_dpi (int, optional): Lowest resolution to try. Defaults to 100.
+        max_workers (int, optional): Number of figures processed at once. Defaults to None
+            (ThreadPoolExecutor's default).
+        **kwargs: Additional keyword arguments.
+            text_width (str): Width of the text block, as a TeX length. Defaults to '6.5in'.
+            quality (int): Initial JPEG / WEBP quality. Defaults to 90.
+            verbose (bool): If True, print per-figure savings. Defaults to True.
+    
+    Returns:
+        dict: Report with keys 'fits' (bool), 'dpi' (final target), 'original_bytes',
+            'final_bytes', and 'figures' (per-figure records with original and new sizes).
+    
+    Raises:
+        ValueError: If text_width is not a TeX length (e.g. '6.5in' or '0.5\\linewidth').
+    """
+    from .convert import downscale_image
+    from .pacman import parse_file_size
+    
+    max_bytes = parse_file_size(max_bytes)
+    text_width = _parse_tex_length(kwargs.pop('text_width', '6.5in'), 6.5)
+    quality = kwargs.pop('quality', 90)
+    verbose = kwargs.pop('verbose', True)
+    
+    original_bytes = _get_folder_size(output_dir)
+    report = {'fits': original_bytes <= max_bytes, 'dpi': None, 'figures': [],
+              'original_bytes': original_bytes, 'final_bytes': original_bytes}
+    
+    if report['fits']:
+        return report # nothing to do
+    
+    content = read_content(os.path.join(output_dir, main_file))
+    widths = _get_rendered_widths(content, text_width)
+    
+    figures = [entry.name for entry in os.scandir(output_dir) if entry.is_file()
+               and os.path.splitext(entry.name)[1].lower() in _RASTER_EXTENSIONS]
+    
+    with tempfile.TemporaryDirectory() as backup_dir:
+        for figure in figures: # keep originals to avoid compounding losses
+            shutil.copy2(os.path.join(output_dir, figure), backup_dir)
             
-    if kwargs.pop('stitch_bibtex', True):
-        bibtex_files = get_bibtex_files(output_root, output_dir)
-        output_file = os.path.join(output_dir, 'references.bib')
+        def process_figure(figure, target_dpi, target_quality):
+            source_path = os.path.join(backup_dir, figure)
+            target_path = os.path.join(output_dir, figure)
+            
+            stem = os.path.splitext(figure)[0]
+            max_width = round(widths.get(stem, text_width) * target_dpi)
+            
+            original_size, new_size = downscale_image(source_path, max_width, target_path,
+                                                      quality=target_quality)
+            
+            if os.path.getsize(target_path) > os.path.getsize(source_path):
+                shutil.copyfile(source_path, target_path) # keep the smaller file
+                new_size = original_size
+            
+            return {'file': figure, 'original_bytes': os.path.getsize(source_path),
+                    'new_bytes': os.path.getsize(target_path),
+                    'original_size': original_size, 'new_size': new_size}
         
-        if kwargs.get('verbose', False): 
-            print(f'Stitching {len(bibtex_files)} to {output_file}...')
+        target_dpi, target_quality = dpi, quality
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                records = list(executor.map(lambda figure: process_figure(
+                               figure, target_dpi, target_quality), figures))
+                
+                final_bytes = _get_folder_size(output_dir)
+                if final_bytes <= max_bytes or target_dpi <= min_dpi:
+                    break
+                
+                target_dpi = max(min_dpi, int(target_dpi * 0.8))
+                target_quality = max(60, target_quality - 5)
+    
+    report.update({'fits': final_bytes <= max_bytes, 'dpi': target_dpi,
+                   'final_bytes': final_bytes, 'figures': records})
+    
+    if verbose:
+        for record in sorted(records, key=lambda record: record['new_bytes'] - record['original_bytes']):
+            saved = (record['original_bytes'] - record['new_bytes']) / 1024
+            print(f"{record['file']}: {record['original_size']} -> {record['new_size']},",
+                  f"saved {saved:.0f} KB")
+            
+        status = 'fits' if report['fits'] else 'still exceeds'
+        print(f'Submission {status} budget at {target_dpi} DPI:',
+              f'{original_bytes / 1024 ** 2:.1f} MB -> {final_bytes / 1024 ** 2:.1f} MB',
+              f'(budget {max_bytes / 1024 ** 2:.1f} MB)')
+    
+    return report
+
+def _gather_project(project, spec, output_root, overleaf_root, **kwargs):
+    project_path = get_overleaf_path(project, overleaf_root)
+    
+    main_file = spec.get('main_file', None)
+    if main_file is None: # detect from the top-level .tex files
+        main_file = _find_main_tex(project_path)
+        if main_file is None:
+            raise FileNotFoundError(f'No main .tex file found in {project_path}')
+    
+    support_files = spec.get('support_files', None)
+    if support_files is None: # every file referenced by the document
+        support_files = find_all_inputs(project_path, main_file, 
+                                        stitch_first=True, files_only=True)
+        support_files = [file_path for file_path in support_files 
+                         if not file_path.endswith('.tex')]
         
-        stitch_bibtex_files(project_path, bibtex_files, output_file,
-                            cleanup=True, dry_run=False)
+    gather_kwargs = {**kwargs, **spec.get('kwargs', {})}
+    output_dir = os.path.join(output_root, project)
+    
+    stats = {'project': project, 'main_file': main_file,
+             'output_dir': output_dir}
+    
+    gather_submission(project_path, main_file, support_files, 
+                      output_dir, stats=stats, **gather_kwargs)
+    
+    return stats
+
+def gather_submissions(projects, output_root, max_workers=4, summary_file=None, **kwargs):
+    """Gather submission materials for many Overleaf projects concurrently.
+    
+    Each project is gathered with gather_submission in a worker thread. Failures
+    are isolated per project: an exception in one project is recorded in the
+    summary and does not stop the others.
+    
+    Args:
+        projects (Union[list, dict]): Project names (e.g. from list_overleaf_projects),
+            or a dictionary mapping project names to specifications with optional keys
+            'main_file', 'support_files', and 'kwargs' (passed to gather_submission).
+            If the main file is not given, it is detected from the project's top-level
+            .tex files; if the support files are not given, every non-.tex file
+            referenced by the stitched document is gathered.
+        output_root (str): Directory in which one output folder per project is created.
+        max_workers (int, optional): Number of projects gathered at once. Defaults to 4.
+        summary_file (str, optional): If provided, write the summary as JSON to this path.
+            Defaults to None.
+        **kwargs: Additional keyword arguments.
+            overleaf_root (str): Path to the Overleaf root directory.
+            verbose (bool): If True, print a line per finished project. Defaults to True.
+            Any other keyword arguments are passed to gather_submission.
+    
+    Returns:
+        dict: Summary with keys 'projects' (one record per project, with its 'status',
+            'time', per-stage timings, bytes copied, and images converted, or its 'error'),
+            'succeeded', 'failed', and 'total_time' (seconds).
+    """
+    overleaf_root = get_overleaf_root(kwargs.pop('overleaf_root', None))
+    verbose = kwargs.pop('verbose', True)
+    
+    if not isinstance(projects, dict):
+        projects = {project: {} for project in projects}
         
-        new_bibliography = "\\bibliography{references}"
-        content = content.replace(last_bibliography, new_bibliography)
+    def run_project(project):
+        start_time = time.perf_counter()
+        try:
+            record = _gather_project(project, projects[project], output_root, 
+                                     overleaf_root, verbose=False, **kwargs)
+            record['status'] = 'ok'
+            
+        except Exception as error: # isolate failures per project
+            record = {'project': project, 'status': 'failed',
+                      'error': f'{type(error).__name__}: {error}'}
+            
+        record['time'] = time.perf_counter() - start_time
+        return record
+    
+    start_time = time.perf_counter()
+    
+    records = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_project, project) for project in projects]
         
-        if kwargs.get('verbose', True):
-            print(f"Updating {last_bibliography} to {new_bibliography}")
+        for future in tqdm(as_completed(futures), total=len(futures),
+                           desc='Gathering Submissions', disable=not verbose):
+            records.append(future.result())
+            
+    records = sorted(records, key=lambda record: record['project'])
+            
+    summary = {'projects': records,
+               'succeeded': sum(record['status'] == 'ok' for record in records),
+               'failed': sum(record['status'] == 'failed' for record in records),
+               'total_time': time.perf_counter() - start_time}
+    
+    if verbose:
+        for record in records:
+            if record['status'] == 'failed':
+                print(f"Failed: {record['project']} ({record['error']})")
+        
+        print(f"{summary['succeeded']} of {len(records)} submissions gathered",
+              f"in {summary['total_time']:.1f}s")
+    
+    if summary_file is not None:
+        if os.path.dirname(summary_file):
+            os.makedirs(os.path.dirname(summary_file), exist_ok=True)
+        with open(summary_file, 'w') as file:
+            json.dump(summary, file, indent=4)
+    
+    return summary
+
+# Watch Submission Sources ------------------------------------------------
+
+_INOTIFY_MASK = 0x8 | 0x40 | 0x80 | 0x100 | 0x200 # close_write, moved, create, delete
+_INOTIFY_ISDIR, _INOTIFY_OVERFLOW = 0x40000000, 0x4000
+
+def _is_watched_dir(dir_path, exclude_dirs):
+    if os.path.basename(dir_path).startswith('.'):
+        return False # skip hidden folders (.git, etc.)
+    return not any(dir_path == exclude_dir or dir_path.startswith(exclude_dir + os.sep)
+                   for exclude_dir in exclude_dirs)
+
+def _snapshot_tree(root, exclude_dirs):
+    # path -> (mtime_ns, size) for every non-hidden file under root
+    snapshot, stack = {}, [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if _is_watched_dir(entry.path, exclude_dirs):
+                            stack.append(entry.path)
+                    elif not entry.name.startswith('.'):
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue # folder vanished mid-scan
+    return snapshot
+
+def _polling_events(root, exclude_dirs, interval):
+    previous = _snapshot_tree(root, exclude_dirs)
+    while True:
+        time.sleep(interval)
+        current = _snapshot_tree(root, exclude_dirs)
+        changed = {path for path in previous.keys() | current.keys()
+                   if previous.get(path) != current.get(path)}
+        previous = current
+        yield changed
+
+def _inotify_events(root, exclude_dirs, interval):
+    import ctypes, ctypes.util, select, struct
+    
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+    
+    watches = {} # watch descriptor -> directory
+    
+    def add_watches(top):
+        for dir_path, dirs, _ in os.walk(top):
+            dirs[:] = [name for name in dirs if _is_watched_dir(
+                       os.path.join(dir_path, name), exclude_dirs)]
+            wd = libc.inotify_add_watch(fd, os.fsencode(dir_path), _INOTIFY_MASK)
+            if wd >= 0:
+                watches[wd] = dir_path
+    
+    add_watches(root)
+    header_size = struct.calcsize('iIII')
+    
+    try:
+        yield set() # watches are in place
+        while True:
+            changed = set()
+            if select.select([fd], [], [], interval)[0]:
+                buffer = os.read(fd, 64 * 1024)
+                offset = 0
+                while offset < len(buffer):
+                    wd, mask, _, name_len = struct.unpack_from('iIII', buffer, offset)
+                    name = buffer[offset + header_size:offset + header_size + name_len]
+                    offset += header_size + name_len
+                    
+                    if mask & _INOTIFY_OVERFLOW:
+                        changed.add(root); continue # events lost; refresh all
+                    if wd not in watches:
+                        continue # watch removed
+                    
+                    path = os.path.join(watches[wd], os.fsdecode(name.rstrip(b'\0')))
+                    if mask & _INOTIFY_ISDIR:
+                        if mask & 0x180 and _is_watched_dir(path, exclude_dirs):
+                            add_watches(path) # new (or moved-in) folder
+                    elif not os.path.basename(path).startswith('.'):
+                        changed.add(path)
+            yield changed
+    finally:
+        os.close(fd)
+
+def _watch_changes(root, exclude_dirs, backend='auto', interval=0.5, debounce=0.2, deadline=None):
+    # yield debounced sets of changed file paths until the deadline
+    events = None
+    if backend in ['auto', 'inotify'] and sys.platform.startswith('linux'):
+        try: # event-driven, so poll the queue on a short tick
+            events = _inotify_events(root, exclude_dirs, min(interval, debounce / 2))
+            next(events) # set up the watches before any edits
+        except (OSError, AttributeError) as error:
+            if backend == 'inotify':
+                raise error
+            events = None # fall back to polling
+    elif backend == 'inotify':
+        raise ValueError('inotify backend is only available on Linux')
+    elif backend not in ['auto', 'polling']:
+        raise ValueError("backend must be one of 'auto', 'inotify', or 'polling'")
+            
+    if events is None:
+        events = _polling_events(root, exclude_dirs, interval)
+    
+    pending, last_event = set(), None
+    for changed in events:
+        now = time.monotonic()
+        if changed:
+            pending |= changed
+            last_event = now
+            
+        if pending and now - last_event >= debounce:
+            yield pending
+            pending = set()
+            
+        if deadline is not None and now >= deadline:
+            return
+
+def _recopy_support_file(project_path, file_path, new_path, image_format=None):
+    # copy a changed support file to its gathered location, re-converting if needed
+    src_path = os.path.join(project_path, file_path)
+    src_ext = os.path.splitext(file_path)[1]
+    
+    if image_format is None or new_path.endswith(src_ext):
+        shutil.copyfile(src_path, new_path)
+        
+    else: # the gathered copy was converted from the source format
+        copy_path = os.path.splitext(new_path)[0] + src_ext
+        shutil.copyfile(src_path, copy_path)
+        convert_image(copy_path, image_format)
+
+def watch_submission(project_path, main_file, support_files, output_dir, **kwargs):
+    """Keep a gathered submission up to date while its sources are edited.
+    
+    Runs gather_submission once, then watches the project tree (inotify on Linux,
+    polling elsewhere) and, after each debounced burst of saves, applies only the
+    affected updates: changed support files are re-copied (and re-converted if
+    image_format is set), changed .bib files are re-stitched into references.bib,
+    and changed .tex files trigger a re-stitch of the main document. With a
+    size_budget, re-copied figures are downscaled again to fit. Stops on
+    KeyboardInterrupt or after `duration` seconds.
+    
+    Args:
+        project_path (str): Path to the project root directory.
+        main_file (str): Name of the main LaTeX file.
+        support_files (list): List of supporting files to include (images, bibtex, etc.).
+        output_dir (str): Directory where gathered submission will be saved.
+        **kwargs: Additional keyword arguments.
+            backend (str): One of 'auto', 'inotify', or 'polling'. Defaults to 'auto'.
+            interval (float): Polling interval in seconds. Defaults to 0.5.
+            debounce (float): Quiet period (seconds) that ends a burst of changes. Defaults to 0.2.
+            duration (float): Stop watching after this many seconds. Defaults to None (forever).
+            Any other keyword arguments are passed to gather_submission.
+    
+    Returns:
+        int: Number of updates applied.
+        
+    Note:
+        The set of support files is fixed when the watch starts; restart the watch
+        after adding new figures or bibliography files to the document.
+    """
+    backend = kwargs.pop('backend', 'auto')
+    interval = kwargs.pop('interval', 0.5)
+    debounce = kwargs.pop('debounce', 0.2)
+    duration = kwargs.pop('duration', None)
+    
+    if kwargs.pop('prepend_project', False):
+        output_dir = os.path.join(project_path, output_dir)
+        
+    verbose = kwargs.get('verbose', True)
+    
+    stats = kwargs.pop('stats', None)
+    if stats is None:
+        stats = {}
+        
+    # initial full gather
+    gather_submission(project_path, main_file, support_files, output_dir, 
+                      stats=stats, **kwargs)
+    
+    file_map = stats['file_map'] # original -> gathered paths
+    
+    # gather-only options; the rest are forwarded to stitch_tex_files / _update_references
+    main_name = kwargs.pop('main_name', 'manuscript.tex')
+    image_format = kwargs.pop('image_format', None)
+    size_budget = kwargs.pop('size_budget', None)
+    stitch_bibtex = kwargs.pop('stitch_bibtex', True)
+    for key in ['new_names', 'fresh_start']:
+        kwargs.pop(key, None)
+    
+    bibtex_files = [file_path for file_path in file_map if file_path.endswith('.bib')]
+    
+    def refresh_bibtex():
+        # as in the initial gather: stitch every gathered .bib (removed after
+        # stitching), so all of them are re-copied first
+        for file_path in bibtex_files:
+            if os.path.exists(os.path.join(project_path, file_path)):
+                _recopy_support_file(project_path, file_path, file_map[file_path])
                 
-    write_content(os.path.join(output_dir, new_main), content)
+        _stitch_gathered_bibtex(project_path, output_dir, kwargs.get('verbose', False))
+    
+    def refresh_manuscript():
+        content = stitch_tex_files(project_path, main_file, 
+                                   content_only=True, **kwargs)
+        content, last_bibliography = _update_references(content, file_map, **kwargs)
+        
+        if stitch_bibtex:
+            content = content.replace(last_bibliography, "\\bibliography{references}")
+            
+        write_content(os.path.join(output_dir, main_name), content)
+        
+    abs_project = os.path.abspath(project_path)
+    abs_support = {os.path.join(abs_project, file_path): file_path 
+                   for file_path in file_map}
+    
+    deadline = None if duration is None else time.monotonic() + duration
+    changes = _watch_changes(abs_project, [os.path.abspath(output_dir)], backend,
+                             interval, debounce, deadline)
+    
+    if verbose:
+        print(f'Watching {project_path} for changes (Ctrl-C to stop)...')
+    
+    update_count = 0
+    try:
+        for changed in changes:
+            start_time = time.perf_counter()
+            
+            if abs_project in changed: # events were dropped; refresh all
+                changed = set(abs_support) | {os.path.join(abs_project, main_file)}
+                
+            changed_support = [abs_support[path] for path in changed if path in abs_support]
+            
+            for file_path in changed_support:
+                if os.path.exists(os.path.join(project_path, file_path)):
+                    _recopy_support_file(project_path, file_path, 
+                                         file_map[file_path], image_format)
+                
+            if stitch_bibtex and any(path.endswith('.bib') for path in changed_support):
+                refresh_bibtex()
+                
+            changed_tex = [path for path in changed if path.endswith('.tex')]
+            
+            if changed_tex:
+                refresh_manuscript()
+                
+            # as in the initial gather (this returns early if the folder still fits)
+            if size_budget is not None and any(os.path.splitext(file_map[file_path])[1].lower()
+                                               in _RASTER_EXTENSIONS for file_path in 
+                                               changed_support):
+                fit_submission_size(output_dir, size_budget, main_name, verbose=verbose)
+                
+            if changed_support or changed_tex:
+                update_count += 1
+                
+                if verbose:
+                    updated = [os.path.relpath(path, abs_project) for path in changed_tex]
+                    updated += changed_support
+                    print(f'Updated {len(updated)} file(s) in', 
+                          f'{time.perf_counter() - start_time:.2f}s: {updated}')
+                
+    except KeyboardInterrupt:
+        if verbose:
+            print('Stopped watching.')
+            
+    finally:
+        changes.close()
+        
+    return update_count
 
 # Find Document Input -----------------------------------------------------
 
@@ -455,6 +1217,185 @@ def find_all_inputs(project_path, main_file, stitch_first=False, **kwargs):
     
     return results # dictionary with file paths and match context
 
+# Find Unused Assets ------------------------------------------------------
+
+_REFERENCE_COMMANDS = ['includegraphics', 'includesvg', 'includepdf', 'input', 'include',
+                       'subfile', 'bibliography', 'addbibresource', 'lstinputlisting']
+
+_REFERENCE_REGEX = re.compile(r'\\(' + '|'.join(_REFERENCE_COMMANDS) + 
+                              r')\*?\s*(?:\[[^\]]*\]\s*)*\{([^}]*)\}')
+
+_GRAPHICSPATH_REGEX = re.compile(r'\\graphicspath\s*\{((?:\s*\{[^}]*\})+)\s*\}')
+
+_TEX_INPUT_COMMANDS = ['input', 'include', 'subfile']
+
+def build_reference_index(project_path, main_file='main.tex', **kwargs):
+    """Index every file path referenced from a LaTeX document tree.
+    
+    Starting from main_file, each .tex file pulled in by \input, \include or
+    \subfile is read once; references from \includegraphics, \input,
+    \bibliography (and similar commands) are resolved against every
+    \graphicspath prefix. Commented-out references are ignored.
+    
+    Args:
+        project_path (str): Path to the project directory.
+        main_file (str, optional): Name of the main LaTeX file. Defaults to 'main.tex'.
+        **kwargs: Additional keyword arguments.
+            max_depth (int): Maximum nesting depth of .tex inputs. Defaults to 5.
+    
+    Returns:
+        dict: Index with keys 'paths' (set of referenced paths with extensions),
+            'stems' (set of extensionless references), and 'tex_files' (list of
+            .tex files in the document tree), all relative to project_path.
+    """
+    max_depth = kwargs.get('max_depth', 5)
+    
+    tex_files, references, graphics_paths = [], [], ['']
+    queue, seen = [(os.path.normpath(main_file), 0)], set()
+    while queue:
+        tex_file, depth = queue.pop(0)
+        if tex_file in seen:
+            continue # already read (or an include cycle)
+        seen.add(tex_file)
+        
+        tex_path = os.path.join(project_path, tex_file)
+        if not os.path.exists(tex_path):
+            print(f"Warning: File not found: {tex_path}. Skipping...")
+            continue
+        
+        tex_files.append(tex_file)
+        content = re.sub(r'(?<!\\)%.*', '', read_content(tex_path))
+        
+        for match in _GRAPHICSPATH_REGEX.finditer(content):
+            graphics_paths += re.findall(r'\{([^}]*)\}', match.group(1))
+        
+        for command, argument in _REFERENCE_REGEX.findall(content):
+            for reference in [reference.strip() for reference in argument.split(',')]:
+                references.append((command, reference))
+                
+                if command in _TEX_INPUT_COMMANDS and reference:
+                    input_file = os.path.normpath(reference)
+                    if not input_file.endswith('.tex'):
+                        input_file += '.tex'
+                        
+                    if depth < max_depth:
+                        queue.append((input_file, depth + 1))
+                    else: # as in find_tex_inputs
+                        print(f"Warning: Maximum recursion depth reached at {tex_file}.")
+                
+    index = {'paths': set(), 'stems': set(), 'tex_files': tex_files}
+    
+    for command, reference in references:
+        if not reference:
+            continue
+        
+        prefixes = graphics_paths if 'graphics' in command else ['']
+        extensions = {'bibliography': '.bib', 'input': '.tex', 
+                      'include': '.tex', 'subfile': '.tex'}
+        
+        for prefix in prefixes:
+            ref_path = os.path.normpath(os.path.join(prefix, reference))
+            
+            if os.path.splitext(ref_path)[1]:
+                index['paths'].add(ref_path)
+                
+            if command in extensions: # implicit extension
+                index['paths'].add(ref_path + extensions[command])
+                
+            else: # extensionless (or dotted) reference
+                index['stems'].add(ref_path)
+                
+    index['paths'].update(tex_files)
+    
+    return index
+
+def find_unused_assets(project_path, main_file='main.tex', extensions=None, 
+                       prune=False, dry_run=True, **kwargs):
+    """Find (and optionally remove) project files not referenced by the document.
+    
+    Builds the reference index once with build_reference_index, then diffs it
+    against a single walk of the project tree. Compiled output (any .pdf next to
+    a .tex file of the same name, such as main.pdf) is not treated as an asset.
+    
+    Args:
+        project_path (str): Path to the project directory.
+        main_file (str, optional): Name of the main LaTeX file. Defaults to 'main.tex'.
+        extensions (list, optional): File extensions treated as assets. Defaults to
+            image extensions plus '.pdf' and '.eps'.
+        prune (bool, optional): If True, remove the unused assets. Defaults to False.
+        dry_run (bool, optional): If True, only print the files that would be removed
+            when pruning. Defaults to True.
+        **kwargs: Additional keyword arguments.
+            exclusions (list): Skip files whose relative path contains any of these strings.
+            verbose (bool): If True, print the report. Defaults to True.
+    
+    Returns:
+        dict: Report with keys 'unused' (list of relative paths), 'unused_bytes',
+            'referenced' (number of assets in use), and 'total' (number of assets).
+    """
+    from .pacman import _get_extensions
+    
+    exclusions = kwargs.pop('exclusions', [])
+    verbose = kwargs.pop('verbose', True)
+    
+    if extensions is None:
+        extensions = _get_extensions()['image'] + ['.pdf', '.eps']
+    extensions = {extension.lower() for extension in extensions}
+        
+    index = build_reference_index(project_path, main_file, **kwargs)
+    
+    unused, unused_bytes, total = [], 0, 0
+    stack = [project_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            entries = list(entries)
+            
+        names = {entry.name for entry in entries}
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue # skip hidden files and folders
+            
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path); continue
+            
+            base, extension = os.path.splitext(entry.name)
+            if extension.lower() not in extensions:
+                continue # not an asset
+            
+            if extension.lower() == '.pdf' and base + '.tex' in names:
+                continue # compiled output (e.g. main.pdf), not an asset
+                
+            relative_path = os.path.normpath(os.path.relpath(entry.path, project_path))
+            if any(exclusion in relative_path for exclusion in exclusions):
+                continue
+            
+            total += 1
+            if (relative_path in index['paths'] or 
+                os.path.splitext(relative_path)[0] in index['stems']):
+                continue # referenced
+            
+            unused.append(relative_path)
+            unused_bytes += entry.stat(follow_symlinks=False).st_size
+                
+    unused = sorted(unused)
+    
+    if verbose:
+        print(f'{len(unused)} of {total} assets unused',
+              f'({unused_bytes / 1024 ** 2:.1f} MB)')
+    
+    if prune:
+        for relative_path in unused:
+            if dry_run: # print the files to delete
+                print(f'Would remove: {relative_path}')
+            else: # actually delete the files
+                os.remove(os.path.join(project_path, relative_path))
+                
+        if not dry_run and verbose:
+            print(f'Removed {len(unused)} unused assets.')
+    
+    return {'unused': unused, 'unused_bytes': unused_bytes,
+            'referenced': total - len(unused), 'total': total}
+
 # Stitch Tex Documents ----------------------------------------------------
 
 def write_content(file_path, content):
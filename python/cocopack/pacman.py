@@ -1,8 +1,12 @@
-import os, shutil
-import json, tarfile
-from glob import glob
+import os, io, re, time, shutil, fnmatch, threading
+import json, base64, tarfile, hashlib
+import gzip, bz2, lzma
+from stat import S_ISREG
 from itertools import chain
+from collections import deque
 from tqdm.auto import tqdm
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 def delete_git_files(folder_path, dry_run=True):
     """Delete all Git-related files and directories in a given folder.
@@ -48,52 +52,385 @@ def delete_ipynb_checkpoints(target_dir, dry_run=True):
                 else: # actually delete the folders
                     shutil.rmtree(checkpoint_folder)
                     print(f"Deleted {checkpoint_folder}")
+                    
+        # don't descend into (deleted) checkpoint folders
+        dirs[:] = [dir for dir in dirs if dir != '.ipynb_checkpoints']
+
+_JSON_SCALAR = re.compile(r'[^\s,\]}]+') # number, true, false, null
+_JSON_STRUCTURE = re.compile(r'[\[\]{}"]')
+
+def _skip_json_string(text, index):
+    # end of the JSON string starting at index (str.find is fast on long base64)
+    end = text.find('"', index + 1)
+    while end != -1 and text[end - 1] == '\\':
+        backslashes = end - 1
+        while text[backslashes - 1] == '\\':
+            backslashes -= 1
+        if (end - backslashes) % 2 == 0:
+            break # the backslashes escape each other, not the quote
+        end = text.find('"', end + 1)
+        
+    if end == -1:
+        raise ValueError(f'Unterminated JSON string at index {index}')
+    return end + 1
+
+def _skip_json_value(text, index):
+    # end of the JSON value starting at index, without building it
+    if text[index] == '"':
+        return _skip_json_string(text, index)
+    
+    if text[index] not in '[{':
+        return _JSON_SCALAR.match(text, index).end()
+    
+    depth = 0 # brackets, skipping over strings (which may contain brackets)
+    while True:
+        match = _JSON_STRUCTURE.search(text, index)
+        if match is None:
+            raise ValueError(f'Unterminated JSON value at index {index}')
+        
+        token, index = match.group(), match.end()
+        if token == '"':
+            index = _skip_json_string(text, match.start())
+        elif token in '[{':
+            depth += 1
+        else: # closing bracket
+            depth -= 1
+            if depth == 0:
+                return index
+
+def _find_top_level_value(text, key):
+    # (start, end) span of a top-level key's value in a JSON object's raw text;
+    # other values (e.g. cells with large outputs) are skipped, not decoded
+    whitespace = re.compile(r'\s*')
+    indent = _detect_json_indent(text)
+    
+    index = whitespace.match(text, text.index('{') + 1).end()
+    while index < len(text) and text[index] != '}':
+        name_end = _skip_json_string(text, index)
+        name = json.loads(text[index:name_end])
+        
+        index = whitespace.match(text, name_end).end() + 1 # skip ':'
+        start = whitespace.match(text, index).end()
+        
+        end = -1
+        if indent is not None and text[start] in '[{' and text[start + 1] == '\n':
+            # pretty-printed: since strings can't hold raw newlines, the first
+            # closing bracket indented one level is this value's own
+            closing = '\n' + ' ' * indent + (']' if text[start] == '[' else '}')
+            end = text.find(closing, start)
+            end = end + len(closing) if end != -1 else -1
+            
+        if end == -1: # compact (or unusual) formatting
+            end = _skip_json_value(text, start)
+        
+        if name == key:
+            return start, end
+        
+        index = whitespace.match(text, end).end()
+        if text[index] == ',':
+            index = whitespace.match(text, index + 1).end()
+            
+    return None
+
+def _detect_json_indent(text):
+    # indent width used when the file was written (None if compact)
+    indent = re.match(r'\{\s*?\n( +)"', text)
+    return len(indent.group(1)) if indent else None
+
+def _detect_json_format(text):
+    # indent width and ascii-escaping used when the file was written
+    ensure_ascii = text.isascii() and '\\u' in text
+    return _detect_json_indent(text), ensure_ascii
+
+def rewrite_notebook_metadata(notebook_path, updates=None, removals=(), dry_run=False):
+    """Update a notebook's top-level metadata in place, preserving its formatting.
+    
+    Only the metadata block is re-serialized (with the file's own indentation);
+    cells and outputs are kept byte-for-byte. The file is only written if the
+    metadata actually changes, and is replaced atomically.
+    
+    Args:
+        notebook_path (str): Path to the Jupyter notebook file.
+        updates (dict, optional): Metadata keys to set. Defaults to None.
+        removals (iterable, optional): Metadata keys to delete. Defaults to ().
+        dry_run (bool, optional): If True, only report whether the notebook would
+            change. Defaults to False.
+    
+    Returns:
+        bool: True if the notebook was (or, in a dry run, would be) modified.
+    """
+    with open(notebook_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+        
+    span = _find_top_level_value(text, 'metadata')
+    metadata = json.loads(text[span[0]:span[1]]) if span else {}
+    
+    updated = {key: value for key, value in metadata.items() if key not in removals}
+    updated.update(updates or {})
+    
+    if updated == metadata:
+        return False # already up to date
+    
+    if dry_run:
+        return True
+    
+    indent, ensure_ascii = _detect_json_format(text)
+    metadata_text = json.dumps(updated, indent=indent, ensure_ascii=ensure_ascii)
+    
+    if indent is not None: # nest at the top level
+        metadata_text = metadata_text.replace('\n', '\n' + ' ' * indent)
+    
+    if span is not None:
+        text = text[:span[0]] + metadata_text + text[span[1]:]
+        
+    else: # no metadata block yet; append one
+        closing = text.rindex('}')
+        separator = ',\n' + ' ' * (indent or 0) if indent else ', '
+        text = (text[:closing].rstrip() + separator + '"metadata": ' + 
+                metadata_text + ('\n' if indent else '') + text[closing:])
+        
+    _atomic_write(notebook_path, text)
+    
+    return True
+
+def _atomic_write(file_path, text):
+    temp_path = f'{file_path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        
+    shutil.copymode(file_path, temp_path)
+    os.replace(temp_path, file_path) # atomic update
 
 def remove_kernel_metadata(notebook_path):
     """Remove kernel specification metadata from a Jupyter notebook.
     
     Args:
         notebook_path (str): Path to the Jupyter notebook file.
+        
+    Returns:
+        bool: True if the notebook was modified.
     """
-    # Load the notebook
-    with open(notebook_path, 'r') as f:
-        notebook = json.load(f)
-
-    # Remove the kernelspec metadata
-    if 'kernelspec' in notebook['metadata']:
-        del notebook['metadata']['kernelspec']
+    return rewrite_notebook_metadata(notebook_path, removals=['kernelspec'])
 
-    # Save the modified notebook
-    with open(notebook_path, 'w') as f:
-        json.dump(notebook, f, indent=4)
+def _get_colab_metadata():
+    return {'kernelspec': {"name": "python3",
+                           "display_name": "Python 3"},
+            'accelerator': "GPU",
+            'colab': {"provenance": [], 
+                      "gpuType": "T4"}}
         
-def insert_colab_metadata(notebook_path):
+def insert_colab_metadata(notebook_path, dry_run=False):
     """Insert Google Colab metadata into a Jupyter notebook.
     
     This function adds metadata that configures the notebook to use GPU acceleration
-    with a T4 GPU type when opened in Google Colab.
+    with a T4 GPU type when opened in Google Colab. Notebooks whose metadata already
+    matches are left untouched.
     
     Args:
         notebook_path (str): Path to the Jupyter notebook file.
+        dry_run (bool, optional): If True, only report whether the notebook would
+            change. Defaults to False.
+        
+    Returns:
+        bool: True if the notebook was (or would be) modified.
     """
-    with open(notebook_path, 'r') as f:
-        notebook = json.load(f)
+    return rewrite_notebook_metadata(notebook_path, _get_colab_metadata(), dry_run=dry_run)
+
+def _join_source(text):
+    return ''.join(text) if isinstance(text, list) else text
+
+def _truncate_lines(text, max_lines):
+    lines = text.splitlines(keepends=True)
+    if len(lines) <= max_lines:
+        return None # nothing to truncate
+    head, tail = lines[:max_lines // 2], lines[-(max_lines - max_lines // 2):]
+    marker = f'... [{len(lines) - max_lines} lines truncated] ...\n'
+    return ''.join(head + [marker] + tail)
+
+def _keys_are_sorted(value):
+    # True if every object in a decoded JSON value has its keys in sorted order
+    if isinstance(value, dict):
+        return (list(value) == sorted(value) and 
+                all(_keys_are_sorted(item) for item in value.values()))
+    if isinstance(value, list):
+        return all(_keys_are_sorted(item) for item in value)
+    return True
+
+def slim_notebook(notebook_path, max_output_size='100KB', max_stream_lines=200,
+                  externalize_images=True, strip_outputs=False, dry_run=False, **kwargs):
+    """Reduce the size of a notebook by stripping, truncating, or externalizing outputs.
+    
+    Outputs larger than max_output_size are slimmed by type: base64 images are
+    written to files next to the notebook (and referenced from a markdown output)
+    or dropped; long stream and text outputs are truncated to their first and last
+    lines; other rich outputs keep only their text/plain form. Externalized images
+    are named by a hash of their content, so identical images are stored once.
+    The notebook is re-serialized with its original indentation, ascii-escaping,
+    and key order (sorted, as nbformat writes it, if the keys were sorted), and
+    is only written if something changed.
+    
+    Args:
+        notebook_path (str): Path to the Jupyter notebook file.
+        max_output_size (Union[str, int], optional): Outputs larger than this are
+            slimmed (e.g. '100KB'). Defaults to '100KB'.
+        max_stream_lines (int, optional): Lines kept from oversized text outputs.
+            Defaults to 200.
+        externalize_images (bool, optional): If True, save oversized images to files
+            instead of dropping them. Defaults to True.
+        strip_outputs (bool, optional): If True, remove all outputs and execution
+            counts. Defaults to False.
+        dry_run (bool, optional): If True, compute the savings without writing.
+            Defaults to False.
+        **kwargs: Additional keyword arguments.
+            image_dir (str): Folder for externalized images. Defaults to
+                '{notebook name}_files' next to the notebook.
+    
+    Returns:
+        dict: Report with keys 'path', 'original_bytes', 'new_bytes', 'saved_bytes',
+            'images_externalized', 'outputs_truncated', and 'outputs_removed'.
+    """
+    size_limit = parse_file_size(max_output_size)
+    
+    notebook_dir, notebook_name = os.path.split(notebook_path)
+    image_dir = kwargs.pop('image_dir', os.path.join(notebook_dir, 
+                           os.path.splitext(notebook_name)[0] + '_files'))
+    
+    with open(notebook_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    notebook = json.loads(text)
+    
+    report = {'path': notebook_path, 'original_bytes': len(text.encode('utf-8')),
+              'images_externalized': 0, 'outputs_truncated': 0, 'outputs_removed': 0}
+    images_to_write = {} # path: bytes; written only if the notebook is
+    sort_keys = _keys_are_sorted(notebook)
+    
+    for cell in notebook.get('cells', []):
+        if cell.get('cell_type') != 'code':
+            continue
         
-    if 'kernelspec' in notebook['metadata']:
-        del notebook['metadata']['kernelspec']
+        if strip_outputs:
+            report['outputs_removed'] += len(cell.get('outputs', []))
+            cell['outputs'], cell['execution_count'] = [], None
+            continue
         
-    kernelspec = {"name": "python3",
-                  "display_name": "Python 3"}
+        for output in cell.get('outputs', []):
+            if len(json.dumps(output)) <= size_limit:
+                continue # small enough
+            
+            if output.get('output_type') == 'stream':
+                truncated = _truncate_lines(_join_source(output['text']), max_stream_lines)
+                if truncated is not None:
+                    output['text'] = truncated
+                    report['outputs_truncated'] += 1
+                continue
+            
+            data = output.get('data', {})
+            for mime_type in [key for key in data if key.startswith('image/') 
+                              and key != 'image/svg+xml']:
+                if externalize_images:
+                    extension = mime_type.split('/')[1].replace('jpeg', 'jpg')
+                    image_bytes = base64.b64decode(_join_source(data[mime_type]))
+                    image_name = f'{hashlib.sha256(image_bytes).hexdigest()[:16]}.{extension}'
+                    image_path = os.path.join(image_dir, image_name)
+                    images_to_write[image_path] = image_bytes # deduplicated by name
+                    
+                    relative_path = os.path.relpath(image_path, notebook_dir or '.')
+                    data['text/markdown'] = f'![{image_name}]({relative_path})'
+                    report['images_externalized'] += 1
+                    
+                else: # drop the image
+                    report['outputs_removed'] += 1
+                    
+                del data[mime_type]
+                output.get('metadata', {}).pop(mime_type, None)
+                
+            if len(json.dumps(output)) <= size_limit:
+                continue
+            
+            for mime_type in list(data.keys()): # keep only the plain text form
+                if mime_type not in ['text/plain', 'text/markdown']:
+                    del data[mime_type]
+                    report['outputs_removed'] += 1
+                    
+            if 'text/plain' in data:
+                truncated = _truncate_lines(_join_source(data['text/plain']), max_stream_lines)
+                if truncated is not None:
+                    data['text/plain'] = truncated
+                    report['outputs_truncated'] += 1
+                    
+    indent, ensure_ascii = _detect_json_format(text)
+    new_text = json.dumps(notebook, indent=indent, ensure_ascii=ensure_ascii,
+                          sort_keys=sort_keys)
+    if text.endswith('\n'):
+        new_text += '\n'
+        
+    changed = json.loads(new_text) != json.loads(text)
+    new_bytes = len(new_text.encode('utf-8')) if changed else report['original_bytes']
     
-    notebook['metadata']['kernelspec'] = kernelspec
+    report.update({'new_bytes': new_bytes, 
+                   'saved_bytes': report['original_bytes'] - new_bytes})
     
-    notebook['metadata']['accelerator'] = "GPU"
+    if changed and not dry_run:
+        for image_path, image_bytes in images_to_write.items():
+            if os.path.exists(image_path):
+                continue # same content, already externalized
+            os.makedirs(image_dir, exist_ok=True)
+            with open(image_path, 'wb') as f:
+                f.write(image_bytes)
+        _atomic_write(notebook_path, new_text)
+    
+    return report
+
+def _slim_notebook_worker(args):
+    notebook_path, kwargs = args
+    return slim_notebook(notebook_path, **kwargs)
+
+def slim_project_notebooks(project_dir, dry_run=True, max_workers=None, **kwargs):
+    """Slim every notebook in a project (see slim_notebook), in parallel.
+    
+    Args:
+        project_dir (Union[str, list]): Path to the project directory (skipping hidden
+            folders and virtual environments), or a list of notebook paths (e.g. as
+            passed by a pre-commit hook).
+        dry_run (bool, optional): If True, only report the savings without modifying
+            any notebook. Defaults to True.
+        max_workers (int, optional): Number of worker processes. Defaults to None 
+            (one per core); 1 processes notebooks in this process.
+        **kwargs: Additional keyword arguments passed to slim_notebook.
+            verbose (bool): If True, print the bytes saved per notebook. Defaults to True.
+    
+    Returns:
+        list: One slim_notebook report per notebook that was (or would be) slimmed.
+    """
+    verbose = kwargs.pop('verbose', True)
     
-    notebook['metadata']['colab'] = {"provenance": [],
-                                     "gpuType": "T4"}
+    if isinstance(project_dir, str):
+        notebook_paths = list(iter_matching_files(project_dir, include=['*.ipynb'],
+                                                  virtualenvs=False))
+    else: # list of notebook paths
+        notebook_paths = list(project_dir)
     
-    with open(notebook_path, 'w') as f:
-        json.dump(notebook, f, indent=4)
+    jobs = [(notebook_path, {**kwargs, 'dry_run': dry_run}) 
+            for notebook_path in notebook_paths]
+    
+    if max_workers == 1 or len(jobs) <= 1:
+        reports = list(map(_slim_notebook_worker, jobs))
+    else: # parse + rewrite in parallel
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            reports = list(executor.map(_slim_notebook_worker, jobs))
+            
+    reports = [report for report in reports if report['saved_bytes'] != 0]
+    
+    if verbose:
+        for report in sorted(reports, key=lambda report: -report['saved_bytes']):
+            print(f"{'Would slim' if dry_run else 'Slimmed'} {report['path']}:",
+                  f"{_format_size(report['original_bytes'])} -> {_format_size(report['new_bytes'])}")
+            
+        saved = sum(report['saved_bytes'] for report in reports)
+        print(f'{len(reports)} of {len(notebook_paths)} notebooks slimmed,',
+              f'{_format_size(saved)} saved' + (' (dry run)' if dry_run else ''))
+    
+    return reports
 
 def clear_ipynb_checkpoints(project_dir, dry_run=True):
     """Delete all Jupyter Notebook checkpoint directories in a project.
@@ -105,21 +442,155 @@ def clear_ipynb_checkpoints(project_dir, dry_run=True):
     """
     delete_ipynb_checkpoints(project_dir, dry_run)
 
-def clean_project_notebooks(project_dir, dry_run=True):
+def clean_project_notebooks(project_dir, dry_run=True, max_workers=None):
     """Clean Jupyter notebooks in a project by inserting Colab metadata.
     
+    Notebooks are processed concurrently on a process pool; notebooks whose
+    metadata already matches are skipped without being rewritten.
+    
     Args:
-        project_dir (str): Path to the project directory containing notebooks.
+        project_dir (Union[str, list]): Path to the project directory containing notebooks
+            (skipping hidden folders and virtual environments), or a list of notebook paths.
         dry_run (bool, optional): If True, only print the notebooks that would be modified
             without actually modifying them. Defaults to True.
+        max_workers (int, optional): Number of worker processes. Defaults to None 
+            (one per core); 1 processes notebooks in this process.
+            
+    Returns:
+        list: Paths of the notebooks that were (or would be) modified.
+    """
+    if isinstance(project_dir, str):
+        notebook_paths = list(iter_matching_files(project_dir, include=['*.ipynb'],
+                                                  virtualenvs=False))
+    else: # list of notebook paths
+        notebook_paths = list(project_dir)
+        
+    dry_runs = [dry_run] * len(notebook_paths)
+    
+    if max_workers == 1 or len(notebook_paths) <= 1:
+        changes = list(map(insert_colab_metadata, notebook_paths, dry_runs))
+        
+    else: # parse + rewrite in parallel
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            changes = list(executor.map(insert_colab_metadata, notebook_paths, dry_runs))
+            
+    changed = [path for path, change in zip(notebook_paths, changes) if change]
+    
+    for notebook_path in changed:
+        print('Would clean:' if dry_run else 'Cleaned:', notebook_path)
+        
+    print(f'{len(changed)} of {len(notebook_paths)} notebooks',
+          'need cleaning' if dry_run else 'cleaned', 
+          f'({len(notebook_paths) - len(changed)} already up to date)')
+    
+    return changed
+
+def _get_cleanup_rules(rules):
+    # rule name -> match(name, is_dir); extension categories come from _get_extensions
+    builtin_rules = {
+        'git': lambda name, is_dir: name.startswith('.git'),
+        'checkpoints': lambda name, is_dir: is_dir and name == '.ipynb_checkpoints',
+        'pycache': lambda name, is_dir: name == '__pycache__' or name.endswith(('.pyc', '.pyo')),
+    }
+    
+    extensions = _get_extensions()
+    
+    matchers = {}
+    for rule in rules:
+        if rule in builtin_rules:
+            matchers[rule] = builtin_rules[rule]
+            
+        elif rule in extensions:
+            match = compile_path_matcher(extensions[rule])
+            matchers[rule] = lambda name, is_dir, match=match: match(name, name_only=True)
+            
+        elif rule != 'notebooks':
+            raise ValueError(f"Unknown cleanup rule '{rule}'; choose from "+
+                             f"{list(builtin_rules) + ['notebooks'] + list(extensions)}")
+            
+    return matchers
+
+def _remove_path(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else: # the path is a file (or link)
+        os.remove(path)
+
+def clean_project(project_dir, rules=('git', 'checkpoints'), dry_run=True, max_workers=None):
+    """Clean a project in a single traversal, according to a set of rules.
+    
+    The project is walked once; matching folders are recorded and not descended
+    into, nor are other hidden folders or virtual environments (as in
+    iter_matching_files and clean_project_notebooks). A plan with the bytes each
+    rule would free is built (and printed) before anything is deleted, and
+    deletions then run in parallel.
+    
+    Args:
+        project_dir (str): Path to the project directory to clean.
+        rules (iterable, optional): Rules to apply. Built-in rules are 'git' (files and
+            folders starting with '.git'), 'checkpoints' (.ipynb_checkpoints folders),
+            'pycache' (__pycache__ folders and .pyc files), and 'notebooks' (insert Colab
+            metadata, as clean_project_notebooks); any category from _get_extensions 
+            (e.g. 'checkpoint', 'archive') deletes files with those extensions.
+            Defaults to ('git', 'checkpoints').
+        dry_run (bool, optional): If True, only print the plan without deleting anything.
+            Defaults to True.
+        max_workers (int, optional): Number of threads used for deletions. Defaults to None.
+    
+    Returns:
+        dict: The plan, with keys 'items' (list of (path, rule, bytes) to delete),
+            'totals' (bytes per rule), 'total_bytes', and 'notebooks' (notebooks that
+            were, or would be, modified by the 'notebooks' rule).
     """
-    for notebook_path in glob(f'{project_dir}/**/*.ipynb', recursive=True):
-        if dry_run: # names only
-            print('Would clean:', notebook_path)
+    matchers = _get_cleanup_rules(rules)
+    collect_notebooks = 'notebooks' in rules
+    
+    items, notebook_paths = [], []
+    # hidden entries are matched against the rules (e.g. '.git'), but not descended into
+    for _, dirs, files in _walk_project(project_dir, hidden=True, virtualenvs=False):
+        kept_dirs = []
+        for entry, is_dir in [(entry, True) for entry in dirs] + [(entry, False) for entry in files]:
+            rule = next((rule for rule, match in matchers.items()
+                         if match(entry.name, is_dir)), None)
+            
+            if rule is not None: # delete (and don't descend)
+                if is_dir:
+                    size = sum(stat.st_size for _, stat in _walk_file_stats(entry.path))
+                else:
+                    size = entry.stat(follow_symlinks=False).st_size
+                items.append((entry.path, rule, size))
+                
+            elif entry.name.startswith('.'):
+                continue # other hidden files and folders
             
-        else: # apply cleanup ops
-            insert_colab_metadata(notebook_path)
-            #remove_kernel_metadata(notebook_path)
+            elif is_dir:
+                kept_dirs.append(entry)
+                
+            elif collect_notebooks and entry.name.endswith('.ipynb'):
+                notebook_paths.append(entry.path)
+                
+        dirs[:] = kept_dirs # prune matched and hidden folders
+                    
+    totals = {rule: 0 for rule in matchers}
+    for path, rule, size in items:
+        totals[rule] += size
+        print(f'Would remove: {path}' if dry_run else f'Removing  {path}')
+        
+    plan = {'items': items, 'totals': totals, 
+            'total_bytes': sum(totals.values()), 'notebooks': []}
+    
+    for rule, size in totals.items():
+        print(f'{rule}: {len([item for item in items if item[1] == rule])} items,', 
+              f'{_format_size(size)}')
+    
+    if not dry_run: # actually delete, in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_remove_path, [path for path, _, _ in items]))
+            
+    if collect_notebooks:
+        plan['notebooks'] = clean_project_notebooks(notebook_paths, dry_run)
+        
+    return plan
 
 def clear_git_files(project_dir, dry_run=True):
     """Delete all Git-related files and directories in a project.
@@ -131,8 +602,226 @@ def clear_git_files(project_dir, dry_run=True):
     """
     delete_git_files(project_dir, dry_run)
 
+def compile_path_matcher(patterns):
+    """Compile a list of path patterns into a single matching function.
+    
+    Patterns are interpreted by form, so the output of get_exclusions can be used
+    directly:
+    
+    - extensions (e.g. '.png', '.tar.gz', '.cache') match file or folder names 
+      ending with them (case-insensitive);
+    - plain names (e.g. '__pycache__', 'node_modules') match any path component;
+    - glob patterns (e.g. '*.csv', 'data/*.npy') match the name, or the end of
+      the path if they contain a '/';
+    - absolute paths match exactly; other patterns with a '/' match as substrings.
+    
+    Args:
+        patterns (Union[str, list]): Pattern(s) to compile. 
+    
+    Returns:
+        callable: match(path, name_only=False) -> bool. With name_only=True, only the
+            last path component is checked against extensions and names (for pruned
+            walks, where the parent folders have already been checked).
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    
+    extensions, names, exact = set(), set(), set()
+    name_globs, path_regexes = [], []
+    
+    for pattern in patterns or []:
+        if os.path.isabs(pattern):
+            exact.add(os.path.normpath(pattern))
+        elif any(char in pattern for char in '*?['):
+            if '/' in pattern: # match against the end of the path
+                path_regexes.append(r'(?:^|/)' + fnmatch.translate(pattern))
+            else: # match against the name only
+                name_globs.append(fnmatch.translate(pattern))
+        elif '/' in pattern:
+            path_regexes.append(re.escape(pattern))
+        elif pattern.startswith('.'):
+            extensions.add(pattern.lower())
+        else: # plain file or folder name
+            names.add(pattern)
+            
+    name_regex = re.compile('|'.join(name_globs)) if name_globs else None
+    path_regex = re.compile('|'.join(path_regexes)) if path_regexes else None
+    
+    def match_name(name):
+        if name in names:
+            return True
+        if name_regex is not None and name_regex.match(name):
+            return True
+        if extensions:
+            lower_name, index = name.lower(), name.find('.')
+            while index != -1: # check every dotted suffix
+                if lower_name[index:] in extensions:
+                    return True
+                index = name.find('.', index + 1)
+        return False
+    
+    def match(path, name_only=False):
+        if exact and os.path.normpath(os.path.abspath(path)) in exact:
+            return True
+        if path_regex is not None and path_regex.search(path.replace(os.sep, '/')):
+            return True
+        if name_only:
+            return match_name(os.path.basename(path))
+        return any(match_name(part) for part in path.split(os.sep) if part)
+    
+    return match
+
+def iter_matching_files(source, include=None, exclude=None, hidden=False, virtualenvs=True):
+    """Yield file paths under a directory, pruning hidden and excluded folders.
+    
+    Args:
+        source (str): Directory to walk.
+        include (list, optional): Patterns (see compile_path_matcher) a file path must
+            match to be yielded. Defaults to None (all files).
+        exclude (list, optional): Patterns for files and folders to skip; excluded
+            folders are not descended into. Defaults to None.
+        hidden (bool, optional): If True, include hidden files and folders. Defaults to False.
+        virtualenvs (bool, optional): If False, don't descend into virtual environments
+            (folders with a pyvenv.cfg). Defaults to True.
+    
+    Returns:
+        generator: Paths of matching files, joined onto source.
+    """
+    include_match = compile_path_matcher(include) if include else None
+    exclude_match = compile_path_matcher(exclude) if exclude else None
+    
+    for _, _, files in _walk_project(source, hidden, exclude_match, virtualenvs):
+        for entry in files:
+            if include_match is None or include_match(entry.path):
+                yield entry.path
+
+def _walk_project(source, hidden=False, exclude_match=None, virtualenvs=True):
+    # os.walk-style, top-down (dir_path, dirs, files), with os.DirEntry lists; hidden
+    # (unless hidden) and excluded entries are left out, virtual environments are
+    # skipped (unless virtualenvs), and removing folders from dirs prunes them
+    stack = [source]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            continue # unreadable folder
+        
+        if not virtualenvs and dir_path != source:
+            if any(entry.name == 'pyvenv.cfg' for entry in entries):
+                continue # a virtual environment
+        
+        dirs, files = [], []
+        for entry in entries:
+            if not hidden and entry.name.startswith('.'):
+                continue # skip hidden files and folders
+            
+            if exclude_match is not None and exclude_match(entry.path, name_only=True):
+                continue # skip (and prune) this entry
+            
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry)
+            else: # files and links
+                files.append(entry)
+                
+        yield dir_path, dirs, files
+        
+        stack.extend(reversed([entry.path for entry in dirs]))
+
+def _compress_gz(block, level):
+    return gzip.compress(block, compresslevel=level)
+
+def _compress_bz2(block, level):
+    return bz2.compress(block, compresslevel=level)
+
+def _compress_xz(block, level):
+    return lzma.compress(block, preset=level)
+
+# fmt -> file extension, tarfile mode or parallel block codec, default level;
+# pgz / pbz2 / pxz write one compressed stream per block: GNU tar and tarfile's
+# 'r:*' mode read them, but Python's 'r|' stream modes stop after the first block
+COMPRESSION_BACKENDS = {
+    'gz': {'ext': 'gz', 'mode': 'w:gz', 'level': 9},
+    'bz2': {'ext': 'bz2', 'mode': 'w:bz2', 'level': 9},
+    'xz': {'ext': 'xz', 'mode': 'w:xz', 'level': 6},
+    'zst': {'ext': 'zst', 'codec': 'zstd', 'level': 3},
+    'pgz': {'ext': 'gz', 'codec': _compress_gz, 'level': 6, 'block_size': 4 * 1024 ** 2},
+    'pbz2': {'ext': 'bz2', 'codec': _compress_bz2, 'level': 9, 'block_size': 8 * 1024 ** 2},
+    'pxz': {'ext': 'xz', 'codec': _compress_xz, 'level': 6, 'block_size': 16 * 1024 ** 2},
+}
+
+class _ParallelBlockWriter(io.RawIOBase):
+    # File-like writer that compresses fixed-size blocks on a thread pool and
+    # writes them in order. Each block becomes an independent gzip / bz2 / xz
+    # stream; concatenated streams are valid files for the standard decoders
+    # (and tarfile's 'r:*'), but not for tarfile's 'r|*' stream mode.
+    
+    def __init__(self, file_path, codec, level, block_size, workers=None):
+        self._file = open(file_path, 'wb')
+        self._codec, self._level = codec, level
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        self._pending = deque() # futures, in write order
+        
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+    
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(self._codec, block, self._level))
+        while len(self._pending) > 2 * self._workers: # bound memory use
+            self._file.write(self._pending.popleft().result())
+            
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+            while self._pending:
+                self._file.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown()
+            self._file.close()
+            super().close()
+
+def _open_tar_writer(output_file, fmt, **kwargs):
+    # returns (tarfile, closeable compressed stream or None)
+    backend = COMPRESSION_BACKENDS[fmt]
+    level = kwargs.get('level', None) # 0 is a valid level, so don't use `or`
+    level = level if level is not None else backend['level']
+    
+    if 'mode' in backend: # single-threaded tarfile codec
+        level_key = 'preset' if fmt == 'xz' else 'compresslevel'
+        return tarfile.open(output_file, backend['mode'], **{level_key: level}), None
+    
+    if backend['codec'] == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("fmt='zst' requires zstandard. To fix, try:"+
+                              "\npip install zstandard")
+        
+        threads = kwargs.get('workers', None) or -1 # -1: all cores
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+        stream = compressor.stream_writer(open(output_file, 'wb'))
+        
+    else: # block-parallel stdlib codec
+        stream = _ParallelBlockWriter(output_file, backend['codec'], level,
+                                      backend['block_size'], kwargs.get('workers', None))
+        
+    return tarfile.open(fileobj=stream, mode='w|'), stream
+
 def tar_files(source, filename, include=None, exclude=None, 
-              hidden=False, fmt='bz2', dry_run=True):
+              hidden=False, fmt='bz2', dry_run=True, **kwargs):
     """Create a tar archive of files from a source directory or list of files.
     
     Args:
@@ -144,12 +833,36 @@ def tar_files(source, filename, include=None, exclude=None,
             Files matching these patterns will be excluded. Defaults to None.
         hidden (bool, optional): If True, include hidden files (starting with '.'). 
             Defaults to False.
-        fmt (str, optional): Compression format to use ('bz2' or 'gz'). Defaults to 'bz2'.
+        fmt (str, optional): Compression format to use. One of 'bz2', 'gz', 'xz' 
+            (single-threaded), 'zst' (multi-threaded; requires zstandard), or 'pbz2', 
+            'pgz', 'pxz' (block-parallel across all cores; the output is a standard
+            multi-stream .tar.bz2 / .tar.gz / .tar.xz file, readable by GNU tar and
+            tarfile.open(..., 'r:*'), but not by tarfile's 'r|*' stream mode).
+            Defaults to 'bz2'.
         dry_run (bool, optional): If True, only return the list of files that would be included
             without creating the archive. Defaults to True.
+        **kwargs: Additional keyword arguments.
+            level (int): Compression level. Defaults to the backend's default.
+            workers (int): Number of compression threads for parallel formats.
+                Defaults to all cores.
+            volume_size (Union[int, str]): If provided (e.g. '2GB'), split the archive
+                into standalone volumes of about this (uncompressed) size, tracked in a
+                manifest so an interrupted job resumes after the last completed volume;
+                see tar_volumes. Defaults to None.
+            on_volume (callable): Called with (volume_path, volume_record) as each
+                volume completes, e.g. to start an upload. Defaults to None.
+            snapshot (bool): If True, write an incremental archive containing only files
+                that are new or modified since the previous snapshot, plus a deletions
+                list; see tar_snapshot. Requires a directory source. Defaults to False.
+            hash_files (bool): In snapshot mode, also compare content hashes of files
+                whose size or mtime changed. Defaults to False.
+            dedup (bool): If True, store each unique file content once and add
+                duplicates as hardlink entries; see find_duplicate_files. Not
+                combinable with split-volume or snapshot mode. Defaults to False.
     
     Returns:
         list: If dry_run is True, returns the list of files that would be included.
+            dict: In split-volume or snapshot mode, returns the manifest.
         
     Raises:
         ValueError: If an unsupported format is specified or if source is invalid.
@@ -159,36 +872,12 @@ def tar_files(source, filename, include=None, exclude=None,
     if exclude is None:
         exclude = []
 
-    # Define tar file mode based on the format:
-    mode = 'w' # write
-    if fmt == 'bz2':
-        mode += ':bz2'
-    elif fmt == 'gz':
-        mode += ':gz'
-    else: # Invalid format
-        raise ValueError("Unsupported format. Use 'bz2' or 'gz'.")
-
-    # Prep file_list:
-    files_to_tar = []
-    if isinstance(source, str) and os.path.isdir(source):
-        for root, dirs, files in os.walk(source):
-            for name in files:
-                if not hidden and name.startswith('.'):
-                    continue # skip this file
-                    
-                file_path = os.path.join(root, name)
-                
-                if exclude and len(exclude) >= 1:
-                    if any(pattern in file_path 
-                           for pattern in exclude):
-                        continue # skip this file
-                    
-                if include and len(include) >= 1:
-                    if not any(pattern in file_path
-                                for pattern in include):
-                        continue # skip this file
+    if fmt not in COMPRESSION_BACKENDS: # Invalid format
+        raise ValueError(f"Unsupported format. Use one of {list(COMPRESSION_BACKENDS.keys())}.")
 
-                files_to_tar.append(file_path) # add to keep
+    # Prep file_list (streamed from a pruned walk):
+    if isinstance(source, str) and os.path.isdir(source):
+        files_to_tar = iter_matching_files(source, include, exclude, hidden)
                     
     elif isinstance(source, list):
         files_to_tar = source
@@ -196,22 +885,438 @@ def tar_files(source, filename, include=None, exclude=None,
     else: # Invalid argument
         raise ValueError("Source must be a directory path or a list of file paths.")
 
-    output_file = f'{filename}.tar.' + fmt
+    output_file = f'{filename}.tar.' + COMPRESSION_BACKENDS[fmt]['ext']
+    if kwargs.get('volume_size', None) is not None:
+        output_file = f'{filename}.part*.tar.' + COMPRESSION_BACKENDS[fmt]['ext']
+    if kwargs.get('snapshot', False):
+        output_file = f'{filename}.snap*.tar.' + COMPRESSION_BACKENDS[fmt]['ext']
     print(f'Tarring files to: {output_file}')
     output_dir = os.path.dirname(output_file)
 
-    if not os.path.exists(output_dir):
+    if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
+    duplicates = {} # duplicate path -> original path
+    if kwargs.pop('dedup', False):
+        if kwargs.get('snapshot', False) or kwargs.get('volume_size', None) is not None:
+            raise ValueError("dedup cannot be combined with snapshot or volume_size.")
+        
+        files_to_tar = list(files_to_tar)
+        report = find_duplicate_files(files_to_tar, kwargs.get('workers', None))
+        for group in report['groups']:
+            duplicates.update({file_path: group[0] for file_path in group[1:]})
+            
+        print(f"dedup: {len(duplicates)} duplicate files,",
+              f"{report['duplicate_bytes'] / 1024 ** 2:.1f} MB saved",
+              f"({report['hashed_files']} of {len(files_to_tar)} files hashed)")
+
     if dry_run: # Return the specified file_list
         print('dry-run: these files specified:')
-        return files_to_tar
+        return list(files_to_tar)
+    
+    if kwargs.pop('snapshot', False):
+        if not isinstance(source, str):
+            raise ValueError("Snapshot mode requires a directory path as source.")
+        return tar_snapshot(source, filename, files_to_tar, fmt, **kwargs)
+    
+    if kwargs.get('volume_size', None) is not None:
+        return tar_volumes(files_to_tar, filename, fmt, **kwargs)
 
     # Create the tar file
-    with tarfile.open(output_file, mode) as tar:
-        desc = 'Building Tar Archive (Files)'
-        for file_path in tqdm(files_to_tar, desc):
-            tar.add(file_path)
+    tar, stream = _open_tar_writer(output_file, fmt, **kwargs)
+    try:
+        with tar:
+            desc = 'Building Tar Archive (Files)'
+            for file_path in tqdm(files_to_tar, desc):
+                if file_path in duplicates: # link to the stored copy
+                    tarinfo = tar.gettarinfo(file_path)
+                    tarinfo.type, tarinfo.size = tarfile.LNKTYPE, 0
+                    tarinfo.linkname = tar.gettarinfo(duplicates[file_path]).name
+                    tar.addfile(tarinfo)
+                else: # store the content
+                    tar.add(file_path)
+    finally:
+        if stream is not None:
+            stream.close() # flush remaining compressed blocks
+
+_HEAD_SIZE = 64 * 1024 # bytes hashed in the cheap first pass
+
+def _hash_file_head(file_path, head_size=_HEAD_SIZE):
+    with open(file_path, 'rb') as file:
+        return hashlib.sha256(file.read(head_size)).hexdigest()
+
+def find_duplicate_files(file_paths, max_workers=None, min_size=1):
+    """Group files with identical content, hashing only files that could be duplicates.
+    
+    Files are first grouped by size; only files sharing a size are hashed, first
+    by their leading 64 KB and then, within matching groups, in full (files of
+    64 KB or less are fully hashed by the first pass). Hashing runs in parallel
+    on a thread pool. Each file is considered once: repeated paths, and hardlinks
+    to a file already listed (same device and inode), are skipped.
+    
+    Args:
+        file_paths (list): Paths of the files to compare.
+        max_workers (int, optional): Number of hashing threads. Defaults to None
+            (ThreadPoolExecutor's default).
+        min_size (int, optional): Ignore files smaller than this many bytes. Defaults to 1.
+    
+    Returns:
+        dict: Report with keys 'groups' (lists of paths with identical content, in
+            input order), 'duplicate_bytes' (bytes saved by storing each content once),
+            and 'hashed_files' (number of files that had to be hashed).
+    """
+    by_size, inodes = {}, set()
+    for file_path in file_paths:
+        try:
+            file_stat = os.lstat(file_path)
+        except FileNotFoundError:
+            continue
+        
+        if not S_ISREG(file_stat.st_mode) or file_stat.st_size < min_size:
+            continue # symlinks, folders, etc., and small files
+        
+        inode = (file_stat.st_dev, file_stat.st_ino)
+        if inode in inodes:
+            continue # same path listed twice, or a hardlink to a listed file
+        inodes.add(inode)
+        
+        by_size.setdefault(file_stat.st_size, []).append(file_path)
+            
+    candidates = [group for group in by_size.values() if len(group) > 1]
+    hashed_files = set()
+    
+    def regroup(groups, hash_function):
+        file_list = [file_path for group in groups for file_path in group]
+        hashed_files.update(file_list)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            hashes = dict(zip(file_list, executor.map(hash_function, file_list)))
+            
+        regrouped = []
+        for group in groups:
+            by_hash = {}
+            for file_path in group:
+                by_hash.setdefault(hashes[file_path], []).append(file_path)
+            regrouped += [subgroup for subgroup in by_hash.values() if len(subgroup) > 1]
+            
+        return regrouped
+    
+    if candidates: # cheap partial hash, then full hash
+        candidates = regroup(candidates, _hash_file_head)
+        
+    sizes = {file_path: size for size, group in by_size.items() for file_path in group}
+    
+    # the partial hash already covers all of a small file
+    groups = [group for group in candidates if sizes[group[0]] <= _HEAD_SIZE]
+    candidates = [group for group in candidates if sizes[group[0]] > _HEAD_SIZE]
+    if candidates:
+        groups += regroup(candidates, _hash_file)
+        
+    duplicate_bytes = sum(sizes[group[0]] * (len(group) - 1) for group in groups)
+    
+    return {'groups': groups, 'duplicate_bytes': duplicate_bytes,
+            'hashed_files': len(hashed_files)}
+
+class _HashingReader:
+    # file wrapper that hashes the bytes tarfile reads through it
+    
+    def __init__(self, file, hasher):
+        self._file, self._hasher = file, hasher
+        
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self._hasher.update(data)
+        return data
+
+def _write_manifest(manifest_file, manifest):
+    temp_file = manifest_file + '.tmp'
+    with open(temp_file, 'w') as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(temp_file, manifest_file) # atomic update
+
+def _hash_file(file_path, chunk_size=1024 ** 2):
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _get_volume_index(volume_name):
+    # e.g. 'backup.part0003.tar.bz2' -> 3
+    return int(re.search(r'\.part(\d+)\.tar\.', volume_name).group(1))
+
+def tar_volumes(files_to_tar, filename, fmt='bz2', volume_size='2GB', **kwargs):
+    """Write files into a resumable series of standalone tar archive volumes.
+    
+    Files are added in order to volumes named {filename}.part0001.tar.{ext}, ...;
+    a volume is closed once its files reach volume_size (uncompressed; a single
+    larger file gets a volume of its own). After each volume completes, the manifest
+    {filename}.manifest.json is updated atomically with the volume's hash and each
+    file's path, size, mtime, and SHA-256 (computed in the same read that archives
+    it). Re-running with the same filename skips files in completed volumes, so an
+    interrupted job resumes after the last completed volume. Files modified since
+    they were archived (size or mtime) are archived again in a new volume; when
+    extracting the volumes in order, the latest copy wins. Completed volumes stay in
+    the manifest even if they were moved away (e.g. uploaded by on_volume), and new
+    volumes are numbered after the highest existing one, so none is overwritten.
+    
+    Args:
+        files_to_tar (iterable): File paths to archive.
+        filename (str): Base name for the volumes and manifest (without extension).
+        fmt (str, optional): Compression format (see tar_files). Defaults to 'bz2'.
+        volume_size (Union[int, str], optional): Target volume size. Defaults to '2GB'.
+        **kwargs: Additional keyword arguments.
+            on_volume (callable): Called with (volume_path, volume_record) as each
+                volume completes. Defaults to None.
+            Any other keyword arguments (level, workers) are passed to the compressor.
+    
+    Returns:
+        dict: The manifest, with keys 'fmt', 'volume_size', and 'volumes' (a list of
+            records with keys 'name', 'sha256', 'bytes', and 'files').
+    """
+    on_volume = kwargs.pop('on_volume', None)
+    volume_bytes = parse_file_size(volume_size)
+    extension = COMPRESSION_BACKENDS[fmt]['ext']
+    
+    manifest_file = f'{filename}.manifest.json'
+    manifest = {'fmt': fmt, 'volume_size': volume_bytes, 'volumes': []}
+    
+    if os.path.exists(manifest_file): # resume a previous run
+        with open(manifest_file, 'r') as file:
+            previous = json.load(file)
+            
+        if previous.get('fmt') != fmt:
+            raise ValueError(f"{manifest_file} was written with fmt='{previous.get('fmt')}'")
+        
+        # completed volumes are kept even if no longer local (e.g. moved by on_volume)
+        manifest['volumes'] = previous['volumes']
+        
+        print(f"Resuming after {len(manifest['volumes'])} completed volumes")
+    
+    completed = {} # path: latest archived record
+    for volume in manifest['volumes']:
+        for record in volume['files']:
+            completed[record['path']] = record
+    
+    def is_archived(file_path):
+        # archived, and unchanged (size + mtime) since
+        if file_path not in completed:
+            return False
+        
+        try:
+            file_stat = os.lstat(file_path)
+        except FileNotFoundError:
+            return True # removed since; keep the archived copy
+        
+        record = completed[file_path]
+        size = file_stat.st_size if S_ISREG(file_stat.st_mode) else 0
+        return size == record['size'] and file_stat.st_mtime == record['mtime']
+    
+    pending_files = (file_path for file_path in files_to_tar 
+                     if not is_archived(file_path))
+    
+    tar = stream = None
+    volume_index = max([_get_volume_index(volume['name']) 
+                        for volume in manifest['volumes']], default=0)
+    
+    def close_volume():
+        tar.close()
+        if stream is not None:
+            stream.close()
+            
+        volume['sha256'] = _hash_file(volume_path)
+        volume['bytes'] = os.path.getsize(volume_path)
+        manifest['volumes'].append(volume)
+        _write_manifest(manifest_file, manifest)
+        
+        if on_volume is not None:
+            on_volume(volume_path, volume)
+    
+    try:
+        desc = 'Building Tar Volumes (Files)'
+        for file_path in tqdm(pending_files, desc):
+            if tar is None: # start the next volume
+                volume_index += 1
+                volume_path = f'{filename}.part{volume_index:04d}.tar.{extension}'
+                volume = {'name': os.path.basename(volume_path), 'files': []}
+                volume_payload = 0
+                tar, stream = _open_tar_writer(volume_path, fmt, **kwargs)
+            
+            tarinfo = tar.gettarinfo(file_path)
+            hasher = hashlib.sha256()
+            
+            if tarinfo.isreg():
+                with open(file_path, 'rb') as file:
+                    tar.addfile(tarinfo, _HashingReader(file, hasher))
+            else: # links, etc. carry no content
+                tar.addfile(tarinfo)
+                
+            volume['files'].append({'path': file_path, 'size': tarinfo.size,
+                                    'mtime': tarinfo.mtime, 'sha256': hasher.hexdigest()})
+            volume_payload += tarinfo.size
+            
+            if volume_payload >= volume_bytes:
+                close_volume()
+                tar = stream = None
+                
+        if tar is not None: # final, partially filled volume
+            close_volume()
+            tar = stream = None
+            
+    finally: # interrupted: leave the partial volume out of the manifest
+        if tar is not None:
+            tar.close()
+            if stream is not None:
+                stream.close()
+        
+    if not os.path.exists(manifest_file): # nothing to archive
+        _write_manifest(manifest_file, manifest)
+    
+    print(f"{len(manifest['volumes'])} volumes recorded in {manifest_file}")
+    
+    return manifest
+
+SNAPSHOT_DELETIONS = '.snapshot-deletions.json' # archive member listing deletions
+
+def _open_tar_reader(archive_path, fmt):
+    if COMPRESSION_BACKENDS[fmt].get('codec') == 'zstd':
+        import zstandard # required to write the archive, too
+        stream = zstandard.ZstdDecompressor().stream_reader(open(archive_path, 'rb'))
+        return tarfile.open(fileobj=stream, mode='r|')
+    
+    # 'r:*' reads through GzipFile / BZ2File / LZMAFile, which handle the multi-stream
+    # files written by pgz / pbz2 / pxz ('r|*' stops after the first stream)
+    return tarfile.open(archive_path, 'r:*')
+
+def tar_snapshot(source, filename, files_to_tar=None, fmt='bz2', hash_files=False, **kwargs):
+    """Write an incremental archive of files changed since the previous snapshot.
+    
+    The snapshot manifest {filename}.snapshot.json records every file's size and
+    mtime (and SHA-256, if hash_files) as of the last run, along with the chain of
+    archives written so far. The first run archives everything; each later run
+    writes {filename}.snapNNNN.tar.{ext} with only new or modified files, plus a
+    member listing the files deleted since the previous snapshot. Use
+    restore_snapshot to replay the chain.
+    
+    Args:
+        source (str): Directory being archived; member names are relative to it.
+        filename (str): Base name for the archives and manifest (without extension).
+        files_to_tar (iterable, optional): Files under source to consider. 
+            Defaults to None (all non-hidden files).
+        fmt (str, optional): Compression format (see tar_files). Defaults to 'bz2'.
+        hash_files (bool, optional): If True, files whose size or mtime changed are only
+            archived if their content hash changed as well. Defaults to False.
+        **kwargs: Additional keyword arguments passed to the compressor (level, workers).
+    
+    Returns:
+        dict: The updated manifest, with keys 'source', 'fmt', 'chain' (one record
+            per archive, with its name, creation time, and counts of added and
+            deleted files), and 'files'.
+    """
+    kwargs.pop('volume_size', None)
+    extension = COMPRESSION_BACKENDS[fmt]['ext']
+    
+    if files_to_tar is None:
+        files_to_tar = iter_matching_files(source)
+    
+    manifest_file = f'{filename}.snapshot.json'
+    manifest = {'source': os.path.abspath(source), 'fmt': fmt, 'chain': [], 'files': {}}
+    
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r') as file:
+            manifest = json.load(file)
+            
+        if manifest['fmt'] != fmt:
+            raise ValueError(f"{manifest_file} was written with fmt='{manifest['fmt']}'")
+    
+    previous_files = manifest['files']
+    current_files, changed_files = {}, []
+    
+    for file_path in files_to_tar:
+        relative_path = os.path.relpath(file_path, source)
+        stat = os.lstat(file_path) # a (broken) symlink is archived as a link
+        record = [stat.st_size, stat.st_mtime, None]
+        previous = previous_files.get(relative_path, None)
+        
+        if previous is not None and previous[:2] == record[:2]:
+            current_files[relative_path] = previous
+            continue # unchanged
+        
+        if hash_files and S_ISREG(stat.st_mode): # links have no content to hash
+            record[2] = _hash_file(file_path)
+            if previous is not None and previous[2] == record[2]:
+                current_files[relative_path] = record
+                continue # touched, but content unchanged
+            
+        current_files[relative_path] = record
+        changed_files.append(relative_path)
+        
+    deleted_files = sorted(set(previous_files) - set(current_files))
+    
+    archive_path = f"{filename}.snap{len(manifest['chain']) + 1:04d}.tar.{extension}"
+    
+    tar, stream = _open_tar_writer(archive_path, fmt, **kwargs)
+    try:
+        with tar:
+            desc = 'Building Snapshot Archive (Files)'
+            for relative_path in tqdm(changed_files, desc):
+                tar.add(os.path.join(source, relative_path), arcname=relative_path)
+                
+            deletions = json.dumps(deleted_files).encode()
+            tarinfo = tarfile.TarInfo(SNAPSHOT_DELETIONS)
+            tarinfo.size, tarinfo.mtime = len(deletions), time.time()
+            tar.addfile(tarinfo, io.BytesIO(deletions))
+    finally:
+        if stream is not None:
+            stream.close()
+            
+    manifest['chain'].append({'archive': os.path.basename(archive_path),
+                              'created': datetime.now().isoformat(timespec='seconds'),
+                              'added': len(changed_files), 'deleted': len(deleted_files)})
+    manifest['files'] = current_files
+    _write_manifest(manifest_file, manifest)
+    
+    print(f'Snapshot {len(manifest["chain"])}: {len(changed_files)} new or modified,',
+          f'{len(deleted_files)} deleted -> {archive_path}')
+    
+    return manifest
+
+def restore_snapshot(filename, target_dir, upto=None):
+    """Restore a directory by replaying a chain of snapshot archives.
+    
+    Args:
+        filename (str): Base name used with tar_snapshot / tar_files(snapshot=True).
+        target_dir (str): Directory to restore into (created if needed).
+        upto (int, optional): Replay only the first `upto` archives of the chain.
+            Defaults to None (the full chain).
+    """
+    with open(f'{filename}.snapshot.json', 'r') as file:
+        manifest = json.load(file)
+        
+    os.makedirs(target_dir, exist_ok=True)
+    archive_dir = os.path.dirname(filename)
+    
+    for record in manifest['chain'][:upto]:
+        archive_path = os.path.join(archive_dir, record['archive'])
+        deleted_files = []
+        
+        with _open_tar_reader(archive_path, manifest['fmt']) as tar:
+            for member in tar:
+                if member.name == SNAPSHOT_DELETIONS:
+                    deleted_files = json.load(tar.extractfile(member))
+                    
+                elif hasattr(tarfile, 'data_filter'): # safe extraction
+                    tar.extract(member, target_dir, filter='data')
+                    
+                else: # older Python versions
+                    tar.extract(member, target_dir)
+                    
+        for relative_path in deleted_files:
+            deleted_path = os.path.join(target_dir, relative_path)
+            if os.path.exists(deleted_path):
+                os.remove(deleted_path)
+                
+        print(f"Restored {record['archive']} ({record['added']} added, {record['deleted']} deleted)")
 
 def get_file_size(file_path, unit_format='MB'):
     """Get the size of a file in the specified unit format.
@@ -239,6 +1344,183 @@ def get_file_size(file_path, unit_format='MB'):
     size_in_bytes = os.path.getsize(file_path)
     return size_in_bytes / (1024 ** exponents[unit_format])
 
+def parse_file_size(size, unit_format='B'):
+    """Parse a human-readable file size into the specified unit format.
+    
+    Args:
+        size (Union[str, int, float]): Size to parse, e.g. '20MB', '1.5 GB', '512k',
+            or a number (interpreted as bytes).
+        unit_format (str, optional): Unit to return the size in.
+            Options are 'B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB'. 
+            Defaults to 'B'.
+    
+    Returns:
+        float: The size in the specified unit (units are binary, i.e. 1KB = 1024B).
+        
+    Raises:
+        ValueError: If the size string or unit format cannot be parsed.
+    """
+    exponents = {'B': 0, 'KB': 1, 'MB': 2, 'GB': 3, 'TB': 4, 
+                 'PB': 5, 'EB': 6, 'ZB': 7, 'YB': 8}
+    
+    if unit_format not in exponents:
+        raise ValueError(f'unit_format must be one of {list(exponents.keys())}')
+    
+    if isinstance(size, (int, float)):
+        size_in_bytes = float(size)
+        
+    else: # parse number + unit, e.g. '1.5 GiB'
+        match = re.fullmatch(r'\s*([\d.]+)\s*([a-zA-Z]*)\s*', str(size))
+        if match is None:
+            raise ValueError(f'Could not parse file size: {size!r}')
+        
+        number, unit = match.groups()
+        unit = unit.upper().replace('IB', 'B') or 'B'
+        if not unit.endswith('B'):
+            unit += 'B' # e.g. 'K' -> 'KB'
+            
+        if unit not in exponents:
+            raise ValueError(f'Unknown size unit in {size!r}; use one of {list(exponents.keys())}')
+        
+        size_in_bytes = float(number) * (1024 ** exponents[unit])
+        
+    return size_in_bytes / (1024 ** exponents[unit_format])
+
+def _format_size(size_in_bytes):
+    # compact human-readable size, as in du -h (e.g. '512B', '1.2M', '3.0G')
+    for unit in ['B', 'K', 'M', 'G', 'T', 'P']:
+        if size_in_bytes < 1024 or unit == 'P':
+            if unit == 'B':
+                return f'{int(size_in_bytes)}B'
+            return f'{size_in_bytes:.1f}{unit}'
+        size_in_bytes /= 1024
+
+def _du_walk(dir_path, depth, state, recurse=True):
+    # post-order walk: returns the total size of dir_path, recording per-folder
+    # totals (up to max_depth) and per-category totals along the way
+    total_size = 0
+    try:
+        entries = list(os.scandir(dir_path))
+    except OSError:
+        return 0 # unreadable folder
+    
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if recurse:
+                    total_size += _du_walk(entry.path, depth + 1, state)
+                continue
+            
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue # entry vanished
+        
+        if stat.st_nlink > 1: # count hardlinked files once
+            inode = (stat.st_dev, stat.st_ino)
+            with state['lock']:
+                if inode in state['inodes']:
+                    continue
+                state['inodes'].add(inode)
+        
+        size = stat.st_size
+        if not state['apparent'] and hasattr(stat, 'st_blocks'):
+            size = stat.st_blocks * 512 # allocated size, as du reports
+            
+        total_size += size
+        
+        categories = _get_file_categories(entry.name, state['lookup'])
+        with state['lock']:
+            state['file_count'] += 1
+            for category in categories:
+                state['categories'][category] = state['categories'].get(category, 0) + size
+                
+            if depth == 0: # top-level file
+                state['entries'][entry.path] = size
+                
+    if depth <= state['max_depth']:
+        with state['lock']:
+            state['directories'][dir_path] = total_size
+            
+    return total_size
+
+def disk_usage(root='.', max_depth=1, max_workers=None, apparent=False):
+    """Measure disk usage of a directory tree in a single walk.
+    
+    The tree is walked once with os.scandir and sizes are aggregated bottom-up
+    per folder and per file category (from _get_extensions). Hardlinked files
+    are counted once, towards whichever folder is walked first (as du does); the
+    space taken by folder entries themselves is not counted. With max_workers,
+    top-level subtrees are walked in parallel.
+    
+    Args:
+        root (str, optional): Directory to measure. Defaults to '.'.
+        max_depth (int, optional): Record folder totals down to this depth below root.
+            Defaults to 1.
+        max_workers (int, optional): Number of threads walking top-level subtrees.
+            Defaults to None (a single-threaded walk).
+        apparent (bool, optional): If True, report apparent file sizes instead of
+            allocated disk usage (as du --apparent-size). Defaults to False.
+    
+    Returns:
+        dict: Result with keys 'root', 'total_bytes', 'file_count', 'entries' (list of
+            (path, bytes) for each top-level file and folder, largest first),
+            'directories' (folder path -> bytes, down to max_depth), and 'categories'
+            (category -> bytes).
+    """
+    state = {'lock': threading.Lock(), 'inodes': set(), 'apparent': apparent,
+             'lookup': _get_category_lookup(), 'max_depth': max_depth, 
+             'file_count': 0, 'categories': {}, 'directories': {}, 'entries': {}}
+    
+    subdirs = [entry.path for entry in os.scandir(root) 
+               if entry.is_dir(follow_symlinks=False)]
+    
+    with ThreadPoolExecutor(max_workers=max_workers or 1) as executor:
+        subdir_sizes = dict(zip(subdirs, executor.map(
+            lambda subdir: _du_walk(subdir, 1, state), subdirs)))
+        
+    state['entries'].update(subdir_sizes)
+    
+    # top-level files (subtrees already walked)
+    root_files = _du_walk(root, 0, state, recurse=False)
+    total_bytes = root_files + sum(subdir_sizes.values())
+    state['directories'][root] = total_bytes
+    
+    return {'root': root, 'total_bytes': total_bytes, 
+            'file_count': state['file_count'],
+            'entries': sorted(state['entries'].items(), key=lambda item: -item[1]),
+            'directories': state['directories'], 'categories': state['categories']}
+
+def print_disk_usage(root='.', max_workers=None, apparent=False, **kwargs):
+    """Print the disk usage of each entry in a directory, sorted by size.
+    
+    A single-walk Python equivalent of `find . -maxdepth 1 -exec du -sh {} \\; | sort -h`.
+    
+    Args:
+        root (str, optional): Directory to report on. Defaults to '.'.
+        max_workers (int, optional): Number of threads walking top-level subtrees.
+            Defaults to None.
+        apparent (bool, optional): If True, report apparent sizes. Defaults to False.
+        **kwargs: Additional keyword arguments.
+            categories (bool): If True, also print totals per file category. Defaults to False.
+            top (int): Only print the largest `top` entries. Defaults to None (all).
+            
+    Returns:
+        dict: The disk_usage result.
+    """
+    usage = disk_usage(root, 1, max_workers, apparent)
+    
+    entries = usage['entries'][:kwargs.pop('top', None)]
+    for path, size in reversed(entries): # largest last, as sort -h
+        print(f'{_format_size(size):>8}  {path}')
+    print(f"{_format_size(usage['total_bytes']):>8}  {root} (total)")
+    
+    if kwargs.pop('categories', False):
+        print('\nBy category:')
+        for category, size in sorted(usage['categories'].items(), key=lambda item: item[1]):
+            print(f'{_format_size(size):>8}  {category}')
+    
+    return usage
+
 def _get_extensions():
     extensions = {
         'image': ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp', '.webp', '.gif', '.svg'],
@@ -266,23 +1548,148 @@ def _get_extensions():
 
     return extensions  # Accessible dictionary of common extensions
     
+def _walk_file_stats(root, hidden=True, follow_symlinks=False):
+    # single scandir pass: yield (path, stat) for every file under root
+    # (with follow_symlinks, also symlinks to files, with the target's stat)
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if not hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=follow_symlinks):
+                            yield entry.path, entry.stat(follow_symlinks=follow_symlinks)
+                    except OSError:
+                        continue # entry vanished or unreadable
+        except OSError:
+            continue # folder vanished or unreadable
+
+def _scan_file_stats(root, max_workers=None, hidden=True, follow_symlinks=False):
+    # (path, stat) for all files under root, walking top-level subtrees in parallel
+    if max_workers is None or max_workers <= 1:
+        return list(_walk_file_stats(root, hidden, follow_symlinks))
+    
+    file_stats, subdirs = [], []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not hidden and entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file(follow_symlinks=follow_symlinks):
+                try:
+                    file_stats.append((entry.path, entry.stat(follow_symlinks=follow_symlinks)))
+                except OSError:
+                    continue # e.g. a broken symlink
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for subtree_stats in executor.map(lambda subdir: list(
+                _walk_file_stats(subdir, hidden, follow_symlinks)), subdirs):
+            file_stats.extend(subtree_stats)
+        
+    return file_stats
+
+def _get_category_lookup(extensions=None):
+    # extension -> categories (a file may count towards e.g. 'image' and 'media')
+    lookup = {}
+    for category, category_exts in (extensions or _get_extensions()).items():
+        for extension in category_exts:
+            lookup.setdefault(extension.lower(), []).append(category)
+    return lookup
+
+def _get_file_categories(file_path, lookup):
+    name = os.path.basename(file_path).lower()
+    index = name.find('.')
+    while index != -1: # longest dotted suffix first (e.g. '.tar.gz')
+        if name[index:] in lookup:
+            return lookup[name[index:]]
+        index = name.find('.', index + 1)
+    return ['other']
+
+def scan_file_sizes(path_set, max_file_size='20MB', max_workers=None, **kwargs):
+    """Measure file sizes in one pass and flag files larger than a size limit.
+    
+    Directories are walked once with os.scandir, reusing each entry's stat result;
+    with max_workers, top-level subtrees (or, for a list of paths, the stat calls)
+    are processed concurrently, which helps on network filesystems.
+    
+    Args:
+        path_set (Union[str, list]): Either a directory path or a list of file paths.
+        max_file_size (Union[str, int], optional): Size limit as a string with unit
+            (e.g. '20MB', '1.5GB', '500KB') or a number of bytes. Defaults to '20MB'.
+        max_workers (int, optional): Number of threads for stat calls. Defaults to None
+            (a single-threaded walk).
+        **kwargs: Additional keyword arguments.
+            hidden (bool): If True, include hidden files and folders. Defaults to True.
+            follow_symlinks (bool): If True, count symlinks to files (at the size of
+                their target) when walking a directory, as os.walk + os.path.getsize
+                would; if False, skip them. Defaults to True.
+    
+    Returns:
+        dict: Result with keys 'large_files' (path -> size in bytes, for files over
+            the limit), 'sizes' (path -> size for every file), 'totals' (bytes per
+            category from _get_extensions, plus 'other'), 'total_bytes', and 'size_limit'.
+    
+    Raises:
+        ValueError: If path_set is neither a directory nor a list of file paths.
+    """
+    size_limit = parse_file_size(max_file_size)
+    hidden = kwargs.pop('hidden', True)
+    follow_symlinks = kwargs.pop('follow_symlinks', True)
+    
+    if isinstance(path_set, str) and os.path.isdir(path_set):
+        file_stats = _scan_file_stats(path_set, max_workers, hidden, follow_symlinks)
+        sizes = {file_path: stat.st_size for file_path, stat in file_stats}
+        
+    elif isinstance(path_set, (list, tuple)):
+        with ThreadPoolExecutor(max_workers=max_workers or 1) as executor:
+            stats = executor.map(os.stat, path_set)
+            sizes = {file_path: stat.st_size for file_path, stat in zip(path_set, stats)}
+            
+    else: # Invalid argument
+        raise ValueError("path_set must be a directory path or a list of file paths.")
+        
+    lookup = _get_category_lookup()
+    totals = {}
+    for file_path, size in sizes.items():
+        for category in _get_file_categories(file_path, lookup):
+            totals[category] = totals.get(category, 0) + size
+    
+    return {'large_files': {file_path: size for file_path, size 
+                            in sizes.items() if size > size_limit},
+            'sizes': sizes, 'totals': totals, 
+            'total_bytes': sum(sizes.values()), 'size_limit': size_limit}
+    
 def get_exclusions(*exclusion_specs, path_set=None, cache=True,
-                   exclude_by_size=False, max_file_size='20MB'):
+                   exclude_by_size=False, max_file_size='20MB', **kwargs):
     """Get a list of file patterns to exclude based on specified criteria.
     
     Args:
         *exclusion_specs: Variable number of exclusion specifications.
             These can be categories like 'image', 'video', 'audio', etc.
         path_set (Union[str, list], optional): Either a directory path or a list of file paths
-            to check for exclusions by size. Defaults to None.
+            to check for exclusions by size (a path that is not a directory is ignored).
+            Defaults to None.
         cache (bool, optional): If True, include '.cache' in exclusions. Defaults to True.
         exclude_by_size (bool, optional): If True, exclude files larger than max_file_size.
             Defaults to False.
-        max_file_size (str, optional): Maximum file size as a string with unit (e.g., '20MB').
-            Defaults to '20MB'.
+        max_file_size (str, optional): Maximum file size as a string with unit (e.g., '20MB',
+            '1.5GB', '500KB'). Defaults to '20MB'.
+        **kwargs: Additional keyword arguments.
+            max_workers (int): Number of threads for the size scan; see scan_file_sizes.
+            follow_symlinks (bool): If False, skip symlinked files in the size scan.
+                Defaults to True (symlinks count at their target's size).
+            details (bool): If True, return a dictionary with the exclusions and the
+                size scan result instead of a flat list. Defaults to False.
     
     Returns:
-        list: List of file patterns and paths to exclude.
+        list: List of file patterns and paths to exclude. 
+            dict: If details=True, a dictionary with keys 'exclusions' and 'size_scan'
+            (the scan_file_sizes result, or None if no size scan was run).
     """
     extensions = _get_extensions()
     
@@ -294,7 +1701,7 @@ def get_exclusions(*exclusion_specs, path_set=None, cache=True,
             exclusions.extend(extensions[exclusion])
             
         else: # append to unparsable
-            unparsable.extend(exclusion)
+            unparsable.append(exclusion)
 
     if cache: exclusions += ['.cache']
 
@@ -303,18 +1710,17 @@ def get_exclusions(*exclusion_specs, path_set=None, cache=True,
               f'please choose from one of {list(extensions.keys())}')
             
     # Handle large files
+    size_scan = None
+    if isinstance(path_set, str) and not os.path.isdir(path_set):
+        path_set = None # as before: nothing to scan (scan_file_sizes would raise)
+        
     if exclude_by_size and path_set:
-        size_limit = float(max_file_size[:-2])
-        if isinstance(path_set, str) and os.path.isdir(path_set):
-            for root, dirs, files in os.walk(path_set):
-                for name in files:
-                    file_path = os.path.join(root, name)
-                    if get_file_size(file_path) > size_limit:
-                        exclusions.append(file_path)
-                        
-        elif isinstance(path_set, list):
-            for file_path in path_set:
-                if get_file_size(file_path) > size_limit:
-                    exclusions.append(file_path)
+        size_scan = scan_file_sizes(path_set, max_file_size, 
+                                    kwargs.pop('max_workers', None),
+                                    follow_symlinks=kwargs.pop('follow_symlinks', True))
+        exclusions.extend(size_scan['large_files'].keys())
+        
+    if kwargs.pop('details', False):
+        return {'exclusions': exclusions, 'size_scan': size_scan}
 
     return exclusions
\ No newline at end of file
@@ -1,4 +1,4 @@
-import os, sys
+import os, re, sys, json
 
 def diffpath(path, root):
     """Get the relative path between two paths.
@@ -15,72 +15,233 @@ def diffpath(path, root):
     abs_root = os.path.abspath(root)
     return os.path.relpath(abs_path, abs_root)
 
-def print_path_structure(root_dir, max_depth=2, include=None, exclude=None, **kwargs):
-    """Print a hierarchical representation of a directory structure.
+def _compile_name_matcher(patterns):
+    # one compiled regex for a set of substring patterns (None: no filter)
+    if patterns is None:
+        return None
+    
+    if not isinstance(patterns, (list, tuple, set)):
+        patterns = [patterns]
+        
+    if not patterns: # an empty list filters nothing (rather than matching everything)
+        return None
+        
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns)).search
+
+def iter_path_structure(root_dir, max_depth=2, include=None, exclude=None, **kwargs):
+    """Yield the lines of a hierarchical representation of a directory structure.
+    
+    Directories are read with os.scandir, and never opened beyond max_depth;
+    symlinks (including links to folders) are listed as files, not followed.
     
     Args:
         root_dir (str): Path to the root directory to display.
         max_depth (int, optional): Maximum depth of directories to display. Defaults to 2.
         include (Union[str, list], optional): Pattern(s) to include in the output.
-            Only entries containing these patterns will be shown. Defaults to None.
+            Only files whose names contain these patterns will be shown. Defaults to None.
         exclude (Union[str, list], optional): Pattern(s) to exclude from the output.
-            Entries containing these patterns will be excluded. Defaults to None.
+            Files and folders whose names contain these patterns are skipped (and
+            excluded folders are not traversed). Defaults to None.
         **kwargs: Additional keyword arguments.
             whitespace (int): Number of spaces to add before each line. Defaults to 0.
-    """
-    root_dir_depth = root_dir.rstrip(os.sep).count(os.sep)  # Base depth of root directory
-
-    def check_pattern(entry, patterns, exclude=False):
-        if not isinstance(patterns, list):
-            patterns = [patterns]
-        match = any(pattern in entry for pattern in patterns)
-        return match if not exclude else not match
+            summary (bool): Add the file count and total size of each folder
+                to its line. Defaults to False.
+            max_files (int): For folders with more files than this, show a
+                summary line instead of listing the files. Defaults to None.
     
+    Yields:
+        str: Each line of the structure.
+    """
     whitespace = ' ' * kwargs.pop('whitespace', 0)
-
-    for root, dirs, files in os.walk(root_dir):
-        current_depth = root.count(os.sep)
-        if current_depth - root_dir_depth >= max_depth:
-            dirs[:] = []  # Stop traversing further
-            continue
-
+    summary = kwargs.pop('summary', False)
+    max_files = kwargs.pop('max_files', None)
+    
+    include_match = _compile_name_matcher(include)
+    exclude_match = _compile_name_matcher(exclude)
+    
+    if summary or max_files is not None:
+        from .pacman import _format_size
+    
+    def walk(dir_path, level):
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = list(entries)
+        except (PermissionError, FileNotFoundError):
+            return
+            
+        files, subdirs = [], []
+        for entry in entries:
+            if exclude_match is not None and exclude_match(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry)
+            elif include_match is None or include_match(entry.name):
+                files.append(entry)
+                
         # Skip directories without files and beyond max_depth
-        if not files and not dirs and current_depth - root_dir_depth >= max_depth - 1:
-            continue
-
-        # Determine the indentation level
-        level = current_depth - root_dir_depth
-        indent = '—' * (level + 1)
-
-        entries = [] # add dirs + files
+        if not files and not subdirs and level >= max_depth - 1:
+            return
+        
+        indent, subindent = '—' * (level + 1), '—' * (level + 2)
+        
+        files_size = None
+        if summary or (max_files is not None and len(files) > max_files):
+            files_size = sum(entry.stat(follow_symlinks=False).st_size for entry in files)
+        
+        dir_line = f"{whitespace} {indent} {os.path.basename(dir_path)}/"
+        if summary:
+            dir_line += f" ({len(files)} files, {_format_size(files_size)})"
+        yield dir_line
+        
+        if max_files is not None and len(files) > max_files:
+            yield f"{whitespace} {subindent} [{len(files)} files, {_format_size(files_size)}]"
+        else: # list each file
+            for entry in files:
+                yield f"{whitespace} {subindent} {entry.name}"
+                
+        if level + 1 < max_depth: # prune before descending
+            for entry in subdirs:
+                yield from walk(entry.path, level + 1)
+                
+    yield from walk(root_dir.rstrip(os.sep) or os.sep, 0)
 
-        # Aggregate entries
-        subdir = os.path.basename(root)
-        if subdir is not None:
-            entries += [f"{whitespace} {indent} {subdir}/"]
+def print_path_structure(root_dir, max_depth=2, include=None, exclude=None, **kwargs):
+    """Print a hierarchical representation of a directory structure.
+    
+    Lines are printed as they are generated (see iter_path_structure).
+    
+    Args:
+        root_dir (str): Path to the root directory to display.
+        max_depth (int, optional): Maximum depth of directories to display. Defaults to 2.
+        include (Union[str, list], optional): Pattern(s) to include in the output.
+            Only files whose names contain these patterns will be shown. Defaults to None.
+        exclude (Union[str, list], optional): Pattern(s) to exclude from the output.
+            Files and folders whose names contain these patterns are skipped. Defaults to None.
+        **kwargs: Additional keyword arguments.
+            whitespace (int): Number of spaces to add before each line. Defaults to 0.
+            summary (bool): Add the file count and total size of each folder. Defaults to False.
+            max_files (int): Summarize (rather than list) folders with more files. Defaults to None.
+    """
+    for line in iter_path_structure(root_dir, max_depth, include, exclude, **kwargs):
+        print(line)
 
-        # Print files
-        subindent = '—' * (level + 2)
-        for file in files:
-            entries += [f"{whitespace} {subindent} {file}"]
+_PACKAGE_INDEX = {} # in-memory cache: {path entry: {'mtime': ..., 'packages': [...]}}
 
-        # filter entries
-        if include is not None:
-            entries = [entry for entry in entries if check_pattern(entry, include, False)]
+def _normalize_package_name(name):
+    # PEP 503 normalization (e.g. 'Foo_Bar.baz' -> 'foo-bar-baz')
+    return re.sub(r'[-_.]+', '-', name).lower()
 
-        if exclude is not None:
-            entries = [entry for entry in entries if check_pattern(entry, exclude, True)]
+def _index_distribution(dist_path):
+    # metadata record (name, version, files, size, top-level modules) of one *.dist-info
+    # folder, or *.egg-info folder or file (the latter lists no files, so has size 0)
+    from pathlib import Path
+    try: # standard library from Python 3.8
+        from importlib.metadata import PathDistribution
+    except ImportError:
+        try:
+            from importlib_metadata import PathDistribution
+        except ImportError:
+            raise ImportError("index_packages requires importlib.metadata (Python 3.8+). "+
+                              "To fix on older versions, try:\npip install importlib_metadata")
+    
+    distribution = PathDistribution(Path(dist_path))
+    files = distribution.files or []
+    
+    top_level = (distribution.read_text('top_level.txt') or '').split()
+    if not top_level: # derive from the installed files instead
+        top_level = sorted(set(re.sub(r'\.py$', '', file.parts[0]) for file in files
+                               if not file.parts[0].endswith(('.dist-info', '.egg-info', '.pth', '..'))
+                               and file.parts[0] != '__pycache__'))
+    
+    name = distribution.metadata['Name']
+    if not name: # broken metadata; fall back to the name in 'name-version.dist-info'
+        name = os.path.basename(dist_path).split('-')[0]
+    
+    return {'name': name,
+            'version': distribution.version,
+            'location': os.path.dirname(dist_path),
+            'path': dist_path,
+            'top_level': top_level,
+            'file_count': len(files),
+            'size': sum(file.size or 0 for file in files)}
 
-        if len(entries) >= 1:
-            print('\n'.join(entries))
+def index_packages(dir_paths=None, pkg_types=['site-packages'], cache_file=None, refresh=False):
+    """Index the installed distributions on Python's import paths.
+    
+    Each path entry is read once with os.scandir, and each distribution is described
+    from its importlib.metadata record (*.dist-info / *.egg-info) rather than by walking
+    its files. Single-file *.egg-info records (from old distutils installs) list no
+    files, so they are indexed with a file_count and size of 0. The index is cached per path entry, in memory and (optionally) in a JSON
+    file, and is rebuilt only when the path entry's modification time changes (as it
+    does when packages are installed or removed).
+    
+    Args:
+        dir_paths (Union[str, list], optional): Directory paths to search for packages.
+            If None, uses sys.path. Defaults to None.
+        pkg_types (Union[str, list], optional): Only index paths containing one of these
+            (e.g. 'site-packages', 'dist-packages'). Defaults to ['site-packages'].
+        cache_file (str, optional): Path to a JSON file used to persist the index
+            between sessions. Defaults to None (in-memory cache only).
+        refresh (bool, optional): If True, rebuild the index regardless of
+            modification times. Defaults to False.
+    
+    Returns:
+        list: Dictionaries with keys 'name', 'version', 'location', 'path' (of the
+            metadata folder), 'top_level' (importable top-level names), 'file_count'
+            and 'size' (in bytes, from RECORD).
+    """
+    if dir_paths is None or len(dir_paths) == 0: 
+        dir_paths = sys.path # default to sys.path
+        
+    if not isinstance(dir_paths, list):
+        dir_paths = [dir_paths]
+        
+    if not isinstance(pkg_types, list):
+        pkg_types = [pkg_types]
+        
+    dir_paths = [os.path.abspath(path) for path in dir_paths if len(path) >= 1
+                 and any(pkg_type in path for pkg_type in pkg_types) and os.path.isdir(path)]
+    
+    cached_paths = {}
+    if cache_file is not None and os.path.exists(cache_file):
+        with open(cache_file, 'r') as file:
+            cached_paths = json.load(file)
+    
+    packages = []
+    for dir_path in dict.fromkeys(dir_paths): # unique, in order
+        mtime = os.stat(dir_path).st_mtime
+        cached_index = _PACKAGE_INDEX.get(dir_path, cached_paths.get(dir_path, None))
+        
+        if refresh or cached_index is None or cached_index['mtime'] != mtime:
+            with os.scandir(dir_path) as entries:
+                dist_paths = sorted(entry.path for entry in entries # (*.egg-info may be a file)
+                                    if entry.name.endswith(('.dist-info', '.egg-info')))
+                
+            cached_index = {'mtime': mtime, 
+                            'packages': [_index_distribution(path) for path in dist_paths]}
+            
+        _PACKAGE_INDEX[dir_path] = cached_paths[dir_path] = cached_index
+        packages += cached_index['packages']
+        
+    if cache_file is not None: # persist the index for later sessions
+        if os.path.dirname(cache_file):
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            
+        with open(cache_file, 'w') as file:
+            json.dump(cached_paths, file, indent=4)
+        
+    return packages
 
 def list_packages(pkg_names=[], dir_paths=None, pkg_types=['site-packages'], 
                   file_types=['.py'], other_filters=[], **kwargs):
     """List and display package structures from Python's import paths.
     
+    Packages are discovered with index_packages (from their distribution metadata).
+    
     Args:
-        pkg_names (Union[str, list], optional): Name(s) of packages to list.
-            If empty, all packages in found directories will be listed. Defaults to [].
+        pkg_names (Union[str, list], optional): Name(s) of packages to list, as distribution
+            or import names. If empty, all packages in found directories will be listed. 
+            Defaults to [].
         dir_paths (Union[str, list], optional): Directory paths to search for packages.
             If None, uses sys.path. Defaults to None.
         pkg_types (Union[str, list], optional): Types of package directories to look for.
@@ -91,20 +252,27 @@ def list_packages(pkg_names=[], dir_paths=None, pkg_types=['site-packages'],
             Defaults to [].
         **kwargs: Additional keyword arguments.
             global_root (str): Common root path for relative path display.
+            cache_file (str): JSON file to persist the package index (see index_packages).
+            show_structure (bool): If False, only list the packages. Defaults to True.
             max_depth (int): Maximum depth for print_path_structure. Defaults to 2.
+    
+    Returns:
+        list: The matching packages (as returned by index_packages).
     """
     if dir_paths is None or len(dir_paths) == 0: 
         dir_paths = sys.path # default to sys.path
         
+    if not isinstance(dir_paths, list):
+        dir_paths = [dir_paths]
+        
     dir_paths = [path for path in dir_paths if len(path) >= 1]
         
     global_root = kwargs.pop('global_root', os.path.commonpath(dir_paths))
+    cache_file = kwargs.pop('cache_file', None)
+    show_structure = kwargs.pop('show_structure', True)
         
     if not isinstance(pkg_names, list):
         pkg_names = [pkg_names]
-        
-    if not isinstance(pkg_types, list):
-        pkg_types = [pkg_types]
     
     if not isinstance(file_types, list):
         file_types = [file_types]
@@ -113,35 +281,192 @@ def list_packages(pkg_names=[], dir_paths=None, pkg_types=['site-packages'],
         other_filters = [other_filters]
         
     all_filters = file_types + other_filters
-        
-    def _pkg_type_check(path):
-        return any(pkg_type in path for pkg_type in pkg_types)
     
-    def _pkg_name_check(path):
+    pkg_names = set(_normalize_package_name(name) for name in pkg_names)
+        
+    def _pkg_name_check(package):
         if not pkg_names:
             return True
-        return any(pkg_name in path for pkg_name in pkg_names)
+        names = [package['name']] + package['top_level']
+        return any(_normalize_package_name(name) in pkg_names for name in names)
     
-    def _pkg_check_combo(path):
-        if not _pkg_type_check(path):
-            return False
-        
-        for subpath in os.listdir(path):
-            if _pkg_name_check(subpath):
-                return True
-        
-    pkg_dirs = [path for path in dir_paths if _pkg_check_combo(path)]
+    packages = [package for package in index_packages(dir_paths, pkg_types, cache_file)
+                if _pkg_name_check(package)]
     
-    pkg_sets = set(pkg_dir for pkg_dir in pkg_dirs)
+    pkg_sets = {} # location -> packages
+    for package in packages:
+        pkg_sets.setdefault(package['location'], []).append(package)
     
-    for pkg_set in pkg_sets:
+    for pkg_set, pkg_set_packages in pkg_sets.items():
         pkg_set_name = diffpath(pkg_set, global_root)
         print(f"Packages from: {pkg_set_name}")
-        if not pkg_names:
-            pkg_names = os.listdir(pkg_set)
         
-        for pkg_name in pkg_names:
-            if pkg_name in os.listdir(pkg_set):
-                print(f'  Package: {pkg_name}')
-                package = os.path.join(pkg_set, pkg_name)
-                print_path_structure(package, include=all_filters, whitespace=4, **kwargs)
\ No newline at end of file
+        for package in pkg_set_packages:
+            print(f"  Package: {package['name']} ({package['version']})")
+            if not show_structure:
+                continue
+            
+            for module_name in package['top_level']:
+                module_path = os.path.join(pkg_set, module_name)
+                if os.path.isdir(module_path):
+                    print_path_structure(module_path, include=all_filters, whitespace=4, **kwargs)
+                    
+    return packages
+
+# Package Footprint -------------------------------------------------------
+
+def _get_disk_footprint(dist_path):
+    # (file count, bytes on disk) of the files listed in a distribution's RECORD
+    from pathlib import Path
+    try:
+        from importlib.metadata import PathDistribution
+    except ImportError:
+        from importlib_metadata import PathDistribution
+    
+    distribution = PathDistribution(Path(dist_path))
+    
+    file_count, total_size = 0, 0
+    for file in distribution.files or []:
+        try:
+            total_size += os.stat(distribution.locate_file(file)).st_size
+            file_count += 1
+        except OSError: # listed, but missing on disk
+            continue
+        
+    return file_count, total_size
+
+def _measure_import_time(module_name, python=None, timeout=60):
+    # seconds to import module_name in a fresh interpreter (None if it fails)
+    import subprocess
+    
+    code = ('import time; start = time.perf_counter(); '+
+            f'import {module_name}; print(time.perf_counter() - start)')
+    try:
+        result = subprocess.run([python or sys.executable, '-c', code], timeout=timeout,
+                                capture_output=True, text=True)
+    except subprocess.TimeoutExpired:
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    return float(result.stdout.strip().splitlines()[-1])
+
+def package_footprint(pkg_names=[], dir_paths=None, import_time=False, max_workers=None, **kwargs):
+    """Measure the disk footprint (and optionally import cost) of installed packages.
+    
+    Each distribution is sized from the files listed in its RECORD (stat-ed in
+    parallel, so compiled and data files count). With import_time=True, each
+    top-level module is also imported in its own fresh interpreter (run by a
+    pool of workers), so import times are cold and independent of one another.
+    
+    Args:
+        pkg_names (Union[str, list], optional): Name(s) of packages to report, as
+            distribution or import names. If empty, all packages are reported. Defaults to [].
+        dir_paths (Union[str, list], optional): Directory paths to search for packages.
+            If None, uses sys.path. Defaults to None.
+        import_time (bool, optional): If True, measure the import time of each
+            top-level module. Note this imports the packages. Defaults to False.
+        max_workers (int, optional): Number of threads (and, for import times, of
+            concurrent interpreters). Defaults to None (os.cpu_count()).
+        **kwargs: Additional keyword arguments.
+            pkg_types (list): Types of package directories to look for. Defaults to ['site-packages'].
+            python (str): Interpreter used for import times. Defaults to sys.executable.
+            timeout (float): Maximum seconds per import. Defaults to 60.
+            sort_by (str): 'size', 'file_count', 'import_time' or 'name'. Defaults to 'size'.
+    
+    Returns:
+        list: Dictionaries with keys 'name', 'version', 'location', 'file_count', 'size'
+            (bytes on disk), and, if import_time, 'import_times' ({module: seconds, or 
+            None if the import failed}) and 'import_time' (the slowest of these).
+    
+    Raises:
+        ValueError: If sort_by is not one of the fields above.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    pkg_types = kwargs.pop('pkg_types', ['site-packages'])
+    python = kwargs.pop('python', None)
+    timeout = kwargs.pop('timeout', 60)
+    sort_by = kwargs.pop('sort_by', 'size')
+    
+    sort_fields = ['size', 'file_count', 'import_time', 'name']
+    if sort_by not in sort_fields: # numeric fields (largest first), or name
+        raise ValueError(f"Unknown sort_by '{sort_by}'; choose from "+
+                         ", ".join(f"'{field}'" for field in sort_fields))
+    
+    if not isinstance(pkg_names, list):
+        pkg_names = [pkg_names]
+    
+    pkg_names = set(_normalize_package_name(name) for name in pkg_names)
+    
+    packages = [package for package in index_packages(dir_paths, pkg_types)
+                if not pkg_names or any(_normalize_package_name(name) in pkg_names
+                                        for name in [package['name']] + package['top_level'])]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        footprints = list(executor.map(_get_disk_footprint, [package['path'] for package in packages]))
+        
+        report = [{'name': package['name'], 'version': package['version'],
+                   'location': package['location'], 'file_count': file_count, 'size': size}
+                  for package, (file_count, size) in zip(packages, footprints)]
+        
+        if import_time: # one fresh interpreter per top-level module
+            modules = [(item, module) for item, package in zip(report, packages)
+                       for module in package['top_level'] if module.isidentifier()]
+            
+            times = executor.map(lambda module: _measure_import_time(module, python, timeout),
+                                 [module for _, module in modules])
+            
+            for item in report:
+                item['import_times'] = {}
+            for (item, module), seconds in zip(modules, times):
+                item['import_times'][module] = seconds
+            for item in report:
+                measured = [seconds for seconds in item['import_times'].values() if seconds is not None]
+                item['import_time'] = max(measured) if measured else None
+                
+    if sort_by == 'name':
+        report.sort(key=lambda item: item['name'].lower())
+    else: # largest first (unmeasured last)
+        report.sort(key=lambda item: -(item.get(sort_by, None) or 0))
+        
+    return report
+
+def print_package_footprint(pkg_names=[], dir_paths=None, import_time=False, max_workers=None, **kwargs):
+    """Print a table of the disk footprint (and optionally import cost) of installed packages.
+    
+    Args:
+        pkg_names (Union[str, list], optional): Name(s) of packages to report. Defaults to [].
+        dir_paths (Union[str, list], optional): Directory paths to search for packages.
+            If None, uses sys.path. Defaults to None.
+        import_time (bool, optional): If True, also measure import times. Defaults to False.
+        max_workers (int, optional): Number of threads / concurrent interpreters. Defaults to None.
+        **kwargs: Additional keyword arguments, passed to package_footprint (e.g. sort_by).
+            top (int): Only show the first N packages. Defaults to None (all).
+    
+    Returns:
+        list: The report (as returned by package_footprint).
+    """
+    from .pacman import _format_size
+    
+    top = kwargs.pop('top', None)
+    report = package_footprint(pkg_names, dir_paths, import_time, max_workers, **kwargs)
+    
+    header = f"{'package':<32}{'version':<14}{'files':>8}{'size':>10}"
+    if import_time:
+        header += f"{'import (ms)':>14}"
+    print(header)
+    
+    for item in report[:top]:
+        line = (f"{item['name'][:31]:<32}{item['version'][:13]:<14}"+
+                f"{item['file_count']:>8}{_format_size(item['size']):>10}")
+        if import_time:
+            seconds = item['import_time']
+            line += f"{'-' if seconds is None else f'{seconds * 1000:.1f}':>14}"
+        print(line)
+        
+    total_size = sum(item['size'] for item in report)
+    print(f"\n{len(report)} packages, {_format_size(total_size)} on disk")
+    
+    return report
@@ -1,15 +1,34 @@
-from . import commands as shell_commands
-from .install import install_shell_scripts
+import importlib
 
-from .commands import (
-    run_shell_command as run,
-    show_symlinks,
-    show_storage,
-    move_with_symlink,
-)
+# attributes are resolved on first use (PEP 562), so that the
+# cocopack CLI can import shellpack.cli without loading commands
+_LAZY_EXPORTS = {
+    'shell_commands': ('commands', None),
+    'ezshell': ('ezshell', None),
+    'install_shell_scripts': ('install', 'install_shell_scripts'),
+    'run': ('commands', 'run_shell_command'),
+    'show_symlinks': ('commands', 'show_symlinks'),
+    'show_storage': ('commands', 'show_storage'),
+    'move_with_symlink': ('commands', 'move_with_symlink'),
+}
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    module_name, attribute = _LAZY_EXPORTS[name]
+    module = importlib.import_module(f'.{module_name}', __name__)
+    value = module if attribute is None else getattr(module, attribute)
+
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     'shell_commands',
+    'ezshell',
     'install_shell_scripts',
     'show_symlinks',
     'show_storage',
@@ -1,8 +1,9 @@
-import os, sys, subprocess, importlib
+import os, sys, importlib
 from pathlib import Path
-from warnings import warn
 
-from .install import uninstall_shell_scripts
+# NOTE: SHELL_COMMANDS and DIRECT_COMMANDS are the static command registry:
+# main() dispatches from these alone, importing only the target module on demand,
+# so keep this module's top-level imports to the (cheap) standard library.
 
 # Core shell scripts
 SHELL_COMMANDS = {
@@ -16,6 +17,7 @@ DIRECT_COMMANDS = {
     'color-wrap': {'module': 'commands', 'function': 'color_wrap'},
     'symlinks': {'module': 'commands', 'function': 'show_symlinks'},
     'storage': {'module': 'commands', 'function': 'show_storage'},
+    'slim-notebooks': {'module': 'commands', 'function': 'slim_notebooks'},
     'safe-remove': {'module': 'commands', 'function': 'safe_remove'},
     'rcd': {'module': 'commands', 'function': 'rcd'},
     'move-with-symlink': {'module': 'commands', 'function': 'move_with_symlink'},
@@ -48,6 +50,8 @@ def get_script_path(script_name):
 
 def run_script(script_path, *args):
     """Run a shell script with arguments"""
+    import subprocess
+    
     cmd = ['/bin/bash', str(script_path)] + list(args)
     subprocess.run(cmd, check=True)
 
@@ -1,4 +1,4 @@
-import os, sys, subprocess
+import os, sys
 from .cli import get_script_path
 
 def run_shell_command(cmd, capture_output=False):
@@ -16,40 +16,231 @@ def run_shell_command(cmd, capture_output=False):
         # Prints all .txt files in current directory
     """
     if capture_output:
+        import subprocess
         output = subprocess.run(cmd, shell=True, check=True, capture_output=True)
         return output.stdout if output.returncode == 0 else output.stderr
     else: # default to os
         return os.system(cmd)
 
-def run_shell_function(script_name, function_name, *args):
-    """Run a shell function from a script"""
+class ShellFunctionServer:
+    """A long-lived bash coprocess with a shell script sourced once.
+
+    Function calls are written to the shell over a pipe (with each argument
+    quoted by shlex), so repeated calls don't fork and re-source a new shell.
+    Each call returns its own exit code and captured stdout / stderr, and the
+    shell is restarted automatically if it dies (e.g. a function calls exit).
+
+    Args:
+        script_path (str): Path to the shell script to source.
+        isolate (bool, optional): If True, run each call in a subshell, so that
+            changes to the directory or variables don't leak into later calls.
+            Defaults to True.
+
+    Examples:
+        >>> server = ShellFunctionServer(get_script_path('ezshell.sh'))
+        >>> server.call('make_hidden', 'notes.txt')
+        (0, 'Hidden: ./.notes.txt\\n', '')
+    """
+    def __init__(self, script_path, isolate=True):
+        import threading
+
+        self.script_path = str(script_path)
+        self.isolate = isolate
+        self.process = None
+        self.lock = threading.Lock()
+        self.sentinel = f'__cocopack_done_{os.getpid()}_{id(self)}__'
+
+    def start(self):
+        import shlex, tempfile, subprocess
+
+        if self.process is None: # stderr of each call is captured here
+            handle, self.stderr_path = tempfile.mkstemp(prefix='cocopack-shell-')
+            os.close(handle)
+
+        self.process = subprocess.Popen(['bash', '--noprofile', '--norc'], text=True,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+
+        self._send(f'source {shlex.quote(self.script_path)} </dev/null')
+        self._read_result() # discard anything printed on source
+
+    def _send(self, command):
+        self.process.stdin.write(f"{command}\nprintf '\\n{self.sentinel} %d\\n' $?\n")
+        self.process.stdin.flush()
+
+    def _read_result(self):
+        lines = []
+        for line in iter(self.process.stdout.readline, ''):
+            if line.startswith(self.sentinel):
+                return int(line.split()[-1]), ''.join(lines)[:-1]
+            lines.append(line)
+
+        # EOF: the shell died during the call
+        return self.process.wait(), ''.join(lines)
+
+    def call(self, function_name, *args):
+        """Call function_name with args; returns (exit_code, stdout, stderr)."""
+        import shlex
+
+        command = ' '.join([function_name] + [shlex.quote(str(arg)) for arg in args])
+        if self.isolate:
+            command = f'( {command} )'
+
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self.start()
+
+            try: # stdin is detached so functions can't consume our pipe
+                self._send(f'{command} </dev/null 2>{shlex.quote(self.stderr_path)}')
+            except BrokenPipeError:
+                self.start()
+                self._send(f'{command} </dev/null 2>{shlex.quote(self.stderr_path)}')
+
+            exit_code, stdout = self._read_result()
+
+            with open(self.stderr_path) as file:
+                stderr = file.read()
+
+        return exit_code, stdout, stderr
+
+    def close(self):
+        """Stop the shell and remove its temporary files."""
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.stdin.close()
+                self.process.wait()
+
+            os.remove(self.stderr_path)
+            self.process = None
+
+_SHELL_SERVERS = {}
+
+def get_shell_server(script_name, isolate=True):
+    """Get (or start) the persistent ShellFunctionServer for a script"""
     script_path = get_script_path(script_name)
-    
+
+    if (script_path, isolate) not in _SHELL_SERVERS:
+        if not _SHELL_SERVERS: # stop all servers on interpreter exit
+            import atexit
+            atexit.register(lambda: [server.close() for server in _SHELL_SERVERS.values()])
+
+        _SHELL_SERVERS[(script_path, isolate)] = ShellFunctionServer(script_path, isolate)
+
+    return _SHELL_SERVERS[(script_path, isolate)]
+
+def run_shell_function(script_name, function_name, *args, persistent=False, capture_output=False):
+    """Run a shell function from a script
+
+    Args:
+        script_name (str): Name of (or path to) the shell script defining the function.
+        function_name (str): Name of the shell function to run.
+        *args: Arguments to the function.
+        persistent (bool, optional): If True, run the function in a long-lived shell
+            that keeps the script sourced (see ShellFunctionServer), instead of a fresh
+            shell per call. Arguments are then quoted automatically. Defaults to False.
+        capture_output (bool, optional): If True, return (exit_code, stdout, stderr)
+            instead of printing the output. Defaults to False.
+
+    Returns:
+        int: The exit code of the function (or a tuple, if capture_output).
+    """
+    script_path = get_script_path(script_name)
+
     if not script_path.exists():
         print(f"Error: Script not found: {script_path}")
         return 1
-    
+
+    if persistent:
+        exit_code, stdout, stderr = get_shell_server(script_name).call(function_name, *args)
+
+        if capture_output:
+            return exit_code, stdout, stderr
+
+        sys.stdout.write(stdout)
+        sys.stderr.write(stderr)
+        return exit_code
+
     # For color_wrap, we need to handle the arguments differently
     if function_name == 'color_wrap':
         cmd = f"bash -c 'source {script_path} && {function_name} {args[0]} {args[1]}'"
     else:
         cmd = f"source {script_path} && {function_name} {' '.join(args)}"
     
+    if capture_output: # same shell as os.system, with the output piped back
+        import subprocess
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+    
     return os.system(cmd)
 
 ### from shell/ezshell.sh
 
+def run_native_or_shell(function_name, *args):
+    """Run the native (ezshell.py) version of an ezshell.sh helper, if there is one
+    
+    Set COCOPACK_SHELL_FALLBACK=1 to always use the shell version instead.
+    """
+    from . import ezshell
+    
+    native_function = getattr(ezshell, f'{function_name}_main', None)
+    if native_function is None or os.environ.get('COCOPACK_SHELL_FALLBACK'):
+        return run_shell_function('ezshell.sh', function_name, *args)
+    
+    return native_function(list(args))
+
 def show_symlinks():
     """Direct command for show_symlinks"""
-    return run_shell_function('ezshell.sh', 'show_symlinks', *sys.argv[1:])
+    return run_native_or_shell('show_symlinks', *sys.argv[1:])
 
 def show_storage():
-    """Direct command for show_storage"""
-    return run_shell_function('ezshell.sh', 'show_storage', *sys.argv[1:])
+    """Direct command for show_storage (single-walk Python disk usage report)"""
+    import argparse
+    from ..pacman import print_disk_usage
+    
+    parser = argparse.ArgumentParser(prog='storage', description=
+                                     'Show disk usage of each entry in a directory, sorted by size.')
+    parser.add_argument('path', nargs='?', default='.', help='Directory to report on (default: .)')
+    parser.add_argument('--workers', type=int, default=None, help='Threads for walking subtrees')
+    parser.add_argument('--apparent-size', action='store_true', help='Report apparent sizes')
+    parser.add_argument('--categories', action='store_true', help='Also report totals per file category')
+    parser.add_argument('--top', type=int, default=None, help='Only show the largest N entries')
+    args = parser.parse_args(sys.argv[1:])
+    
+    print_disk_usage(args.path, args.workers, args.apparent_size,
+                     categories=args.categories, top=args.top)
+    return 0
+
+def slim_notebooks():
+    """Direct command for slim_project_notebooks (usable as a pre-commit hook)"""
+    import argparse
+    from ..pacman import slim_project_notebooks
+    
+    parser = argparse.ArgumentParser(prog='slim-notebooks', description=
+                                     'Strip, truncate, or externalize large notebook outputs.')
+    parser.add_argument('paths', nargs='*', default=['.'], help='Notebooks or directories (default: .)')
+    parser.add_argument('--max-output-size', default='100KB', help='Slim outputs larger than this')
+    parser.add_argument('--max-lines', type=int, default=200, help='Lines kept from long text outputs')
+    parser.add_argument('--strip', action='store_true', help='Remove all outputs')
+    parser.add_argument('--no-externalize', action='store_true', help='Drop large images instead of saving them')
+    parser.add_argument('--check', action='store_true', help='Only report; do not modify notebooks')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    args = parser.parse_args(sys.argv[1:])
+    
+    options = {'max_output_size': args.max_output_size, 'max_stream_lines': args.max_lines,
+               'strip_outputs': args.strip, 'externalize_images': not args.no_externalize}
+    
+    reports = []
+    notebooks = [path for path in args.paths if path.endswith('.ipynb')]
+    for path in [path for path in args.paths if os.path.isdir(path)]:
+        reports += slim_project_notebooks(path, args.check, args.workers, **options)
+    if notebooks:
+        reports += slim_project_notebooks(notebooks, args.check, args.workers, **options)
+    
+    return 1 if reports else 0 # nonzero when notebooks changed (for pre-commit)
 
 def safe_remove():
     """Direct command for safe_remove"""
-    return run_shell_function('ezshell.sh', 'safe_remove', *sys.argv[1:])
+    return run_native_or_shell('safe_remove', *sys.argv[1:])
 
 def rcd():
     """Direct command for rcdf"""
@@ -61,11 +252,11 @@ def move_with_symlink():
 
 def split_path():
     """Direct command for split_path"""
-    return run_shell_function('ezshell.sh', 'split_path', *sys.argv[1:])
+    return run_native_or_shell('split_path', *sys.argv[1:])
 
 def path_cleanup():
     """Direct command for path_cleanup"""
-    return run_shell_function('ezshell.sh', 'path_cleanup', *sys.argv[1:])
+    return run_native_or_shell('path_cleanup', *sys.argv[1:])
 
 def print_python_versions():
     """Direct command for print_python_versions"""
@@ -0,0 +1,327 @@
+"""
+Native Python implementations of the hot shell/ezshell.sh helpers.
+
+These run in-process (no bash fork + source per call), and are used by default
+by the cocopack CLI; set COCOPACK_SHELL_FALLBACK=1 to use the shell versions.
+"""
+import os, re, sys, shutil, argparse
+
+__all__ = [
+    'safe_remove',
+    'split_path',
+    'path_cleanup',
+    'show_symlinks',
+    'show_storage',
+]
+
+def _walk_entries(root, max_depth=None):
+    """Yield (entry, depth) for everything under root, without a stat per entry.
+
+    Symlinks are yielded but never followed. depth is 1 for root's children.
+    """
+    stack = [(root, 1)]
+    while stack:
+        dir_path, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+        subdirs = []
+        for entry in entries:
+            yield entry, depth
+
+            if entry.is_dir(follow_symlinks=False):
+                if max_depth is None or depth < max_depth:
+                    subdirs.append((entry.path, depth + 1))
+
+        # siblings first, then each subfolder's contents (in name order)
+        stack.extend(reversed(subdirs))
+
+### safe_remove ---------------------------------------------------
+
+def safe_remove(target_path, recursive=True, confirm=True):
+    """Remove the contents of a directory, after listing them and asking for confirmation.
+
+    As in the shell version, the target directory itself (and its hidden
+    top-level entries, which the shell's * glob skips) are kept. If the target
+    is a file (or a symlink), that file itself is removed.
+
+    Args:
+        target_path (str): Directory whose contents should be removed (or a file).
+        recursive (bool, optional): If True, also remove subdirectories;
+            otherwise only files are removed. Defaults to True.
+        confirm (bool, optional): If True, ask for confirmation before removing.
+            Defaults to True.
+
+    Returns:
+        bool: True if the items were removed, False if the operation was cancelled.
+
+    Raises:
+        ValueError: If no path is given, or the path is the home directory.
+        FileNotFoundError: If the path does not exist.
+    """
+    if not target_path:
+        raise ValueError("No path provided.")
+
+    if os.path.normpath(os.path.expanduser(target_path)) == os.path.expanduser('~'):
+        raise ValueError("Dangerous operation blocked: You cannot remove the home directory.")
+
+    if not os.path.lexists(target_path):
+        raise FileNotFoundError("The specified path does not exist.")
+
+    is_dir = os.path.isdir(target_path) and not os.path.islink(target_path)
+
+    if is_dir:
+        print(f"The following items will be removed from '{target_path}':")
+        for entry, _ in _walk_entries(target_path):
+            print(entry.path)
+    else: # a single file (or link)
+        print(f"The following item will be removed: {target_path}")
+
+    if confirm:
+        response = input("Are you sure you want to remove the above items? [yes/no] ")
+        if response.strip().lower() not in ['yes', 'y']:
+            print("Operation cancelled.")
+            return False
+
+    if not is_dir:
+        os.remove(target_path)
+        print("Item removed successfully.")
+        return True
+
+    with os.scandir(target_path) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue # not matched by the shell's * glob
+
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    shutil.rmtree(entry.path)
+            else: # files and symlinks
+                os.remove(entry.path)
+
+    print("Items removed successfully.")
+    return True
+
+### PATH helpers --------------------------------------------------
+
+def split_path(value=None):
+    """Split a PATH-like string into a list of entries.
+
+    Args:
+        value (str, optional): The string to split. Defaults to $PATH.
+
+    Returns:
+        list: The entries, in order (including empty entries).
+    """
+    if value is None:
+        value = os.environ.get('PATH', '')
+
+    return value.split(os.pathsep)
+
+PATH_VARIABLES = ['PATH', 'LD_LIBRARY_PATH', 'PYTHONPATH', 'MANPATH']
+
+def _clean_path_entries(entries, remove_duplicates=True, remove_empties=False,
+                        remove_missing=False, keep_first_entry=True, should_ignore=None):
+    # returns (kept entries, {reason: removed entries}), in linear time
+    should_ignore = should_ignore or (lambda entry: False)
+    removed = {'duplicate': [], 'empty': [], 'missing': []}
+
+    if remove_duplicates: # single pass with a set (in reverse to keep the last entry)
+        seen, unique_entries = set(), []
+        for entry in (entries if keep_first_entry else reversed(entries)):
+            if entry not in seen or should_ignore(entry):
+                unique_entries.append(entry)
+                seen.add(entry)
+            else: # repeated entry
+                removed['duplicate'].append(entry)
+
+        entries = unique_entries if keep_first_entry else unique_entries[::-1]
+
+    kept_entries = []
+    for entry in entries:
+        if remove_empties and not entry and not should_ignore(entry):
+            removed['empty'].append(entry)
+        elif remove_missing and entry and not os.path.isdir(entry) and not should_ignore(entry):
+            removed['missing'].append(entry)
+        else: # keep the entry
+            kept_entries.append(entry)
+
+    return kept_entries, removed
+
+def path_cleanup(variables=PATH_VARIABLES, remove_duplicates=True, remove_empties=False,
+                 remove_missing=False, keep_first_entry=True, ignore_patterns=(),
+                 dry_run=True, verbose=True):
+    """Remove duplicate, empty, or missing entries from PATH-like environment variables.
+
+    Args:
+        variables (Union[str, list], optional): Environment variable(s) to clean; those
+            that aren't set are skipped. Defaults to PATH, LD_LIBRARY_PATH, PYTHONPATH
+            and MANPATH.
+        remove_duplicates (bool, optional): Remove repeated entries. Defaults to True.
+        remove_empties (bool, optional): Remove empty entries. Defaults to False.
+        remove_missing (bool, optional): Remove entries that aren't existing directories.
+            Defaults to False.
+        keep_first_entry (bool, optional): For duplicates, keep the first occurrence
+            (otherwise the last). Defaults to True.
+        ignore_patterns (list, optional): Regular expressions for entries to always keep.
+        dry_run (bool, optional): If True, only report what would be removed; otherwise
+            update os.environ. Defaults to True.
+        verbose (bool, optional): If True, print the removals. Defaults to True.
+
+    Returns:
+        dict: For each cleaned variable, a dict with keys 'value' (the cleaned string),
+            and 'duplicate', 'empty' and 'missing' (lists of the removed entries).
+    """
+    if isinstance(variables, str):
+        variables = [variables]
+
+    ignore_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in ignore_patterns))
+
+    def should_ignore(entry):
+        return bool(ignore_patterns) and ignore_regex.search(entry) is not None
+
+    results = {}
+    for variable in [variable for variable in variables if variable in os.environ]:
+        kept_entries, removed = _clean_path_entries(split_path(os.environ[variable]),
+                                                    remove_duplicates, remove_empties,
+                                                    remove_missing, keep_first_entry,
+                                                    should_ignore)
+
+        results[variable] = {'value': os.pathsep.join(kept_entries), **removed}
+
+    if verbose or dry_run:
+        run_status = '(Dry Run) Removing' if dry_run else 'Removing'
+        for variable, result in results.items():
+            prefix = '' if list(results) == ['PATH'] else f'{variable} '
+            for reason in ['duplicate', 'empty', 'missing']:
+                for entry in result[reason]:
+                    print(f'{run_status} {prefix}{reason}: {entry}')
+
+        end_message = 'Path cleanup complete.'
+        if not any(result[reason] for result in results.values()
+                   for reason in ['duplicate', 'empty', 'missing']):
+            end_message += ' No entries removed.'
+        print(end_message)
+
+    if not dry_run:
+        for variable, result in results.items():
+            os.environ[variable] = result['value']
+
+    return results
+
+### listings ------------------------------------------------------
+
+def show_symlinks(path='.', exclude='snapshot'):
+    """Print (and return) the symlinks directly inside a directory.
+
+    Args:
+        path (str, optional): Directory to list. Defaults to '.'.
+        exclude (str, optional): Skip symlinks whose path contains this string.
+            Defaults to 'snapshot' (as in the shell version).
+
+    Returns:
+        list: (link_path, target) tuples.
+    """
+    links = []
+    for entry, _ in _walk_entries(path, max_depth=1):
+        if entry.is_symlink() and not (exclude and exclude in entry.path):
+            links.append((entry.path, os.readlink(entry.path)))
+            print(f'{entry.path} -> {links[-1][1]}')
+
+    return links
+
+def show_storage(path='.', apparent=False):
+    """Print (and return) the disk usage of a directory and each entry in it, sorted by size.
+
+    Built on pacman.disk_usage: the tree is walked once and, as with du,
+    hardlinked files are only counted once.
+
+    Args:
+        path (str, optional): Directory to report on. Defaults to '.'.
+        apparent (bool, optional): If True, report apparent sizes rather than
+            allocated disk usage (as du --apparent-size). Defaults to False.
+
+    Returns:
+        list: (bytes, path) tuples, in ascending order of size.
+    """
+    from ..pacman import disk_usage, _format_size
+
+    usage = disk_usage(path, max_depth=0, apparent=apparent)
+    usage = sorted([(size, entry_path) for entry_path, size in usage['entries']]
+                   + [(usage['total_bytes'], path)])
+
+    for size, entry_path in usage:
+        print(f'{_format_size(size)}\t{entry_path}')
+
+    return usage
+
+### command line entry points -------------------------------------
+
+def _get_path_cleanup_parser(prog='path-cleanup'):
+    parser = argparse.ArgumentParser(prog=prog, description=
+                                     'Remove duplicate, empty, or missing PATH entries.')
+    parser.add_argument('--remove-duplicates', dest='remove_duplicates', action='store_true')
+    parser.add_argument('--keep-duplicates', dest='remove_duplicates', action='store_false')
+    parser.add_argument('--remove-empties', dest='remove_empties', action='store_true')
+    parser.add_argument('--keep-empties', dest='remove_empties', action='store_false')
+    parser.add_argument('--remove-missing', dest='remove_missing', action='store_true')
+    parser.add_argument('--keep-missing', dest='remove_missing', action='store_false')
+    parser.add_argument('--keep-first-entry', dest='keep_first_entry', action='store_true')
+    parser.add_argument('--keep-last-entry', dest='keep_first_entry', action='store_false')
+    parser.add_argument('--apply', dest='dry_run', action='store_false',
+                        help='Print an export statement for the cleaned value (for eval)')
+    parser.add_argument('--quiet', dest='verbose', action='store_false')
+    parser.add_argument('--ignore', dest='ignore_patterns', action='append', default=[],
+                        help='Regex for entries to always keep (repeatable)')
+    parser.add_argument('--variable', dest='variables', action='append', default=None,
+                        help=f'Variable to clean (repeatable; default: {" ".join(PATH_VARIABLES)})')
+    parser.set_defaults(remove_duplicates=True, remove_empties=False, remove_missing=False,
+                        keep_first_entry=True, dry_run=True, verbose=True)
+    return parser
+
+def path_cleanup_main(argv=None):
+    """Command line path_cleanup; with --apply, prints `export VAR=...` lines for eval"""
+    import shlex
+
+    args = _get_path_cleanup_parser().parse_args(argv)
+    args.variables = args.variables or PATH_VARIABLES
+
+    if not args.dry_run: # report to stderr, so stdout can be eval'd
+        stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        results = path_cleanup(**vars(args))
+    finally:
+        if not args.dry_run:
+            sys.stdout = stdout
+
+    if not args.dry_run:
+        for variable, result in results.items():
+            print(f"export {variable}={shlex.quote(result['value'])}")
+    return 0
+
+def split_path_main(argv=None):
+    """Command line split_path; prints one PATH entry per line"""
+    for entry in split_path(*(argv or [])[:1]):
+        print(entry)
+    return 0
+
+def safe_remove_main(argv=None):
+    """Command line safe_remove: safe-remove TARGET_PATH [true|false]"""
+    argv = list(argv or [])
+    target_path = argv[0] if argv else ''
+    recursive = (argv[1] if len(argv) > 1 else 'true') == 'true'
+
+    try:
+        safe_remove(target_path, recursive)
+    except (ValueError, OSError) as error: # incl. missing paths, permissions
+        print(error)
+        return 1
+    return 0
+
+def show_symlinks_main(argv=None):
+    """Command line show_symlinks: symlinks [PATH]"""
+    show_symlinks(*(argv or [])[:1])
+    return 0
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cold start time of the `cocopack` CLI.
+
+Runs a set of cheap CLI invocations in fresh interpreters (exactly as the
+`cocopack` entry point does) and prints the median wall time of each. With
+--baseline, the same invocations are also timed against the package as it
+was at a given git ref, to compare cold start before and after a change.
+
+Usage:
+    python benchmark_cli_startup.py [--baseline REF] [--repeat N]
+
+Options:
+    --commands  CLI invocations to time (default: '--help' 'color-wrap RED hi')
+    --baseline  Git ref to compare against (e.g. HEAD~1, a tag, a branch)
+    --repeat    Number of cold starts per invocation (default: 10)
+"""
+
+import os
+import sys
+import time
+import shlex
+import tarfile
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINT = "import sys; sys.argv = {argv!r}; from cocopack.shellpack.cli import main; main()"
+
+
+def time_command(python_path, command, repeat=10):
+    """Median wall time (seconds) of `cocopack <command>` over repeat cold starts."""
+    argv = ['cocopack'] + shlex.split(command)
+    env = {**os.environ, 'PYTHONPATH': python_path}
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', ENTRY_POINT.format(argv=argv)], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def export_baseline(ref, output_dir):
+    """Export the python/ tree at a git ref into output_dir; return its python path."""
+    archive = subprocess.run(['git', '-C', REPO_ROOT, 'archive', ref, 'python'],
+                             capture_output=True, check=True).stdout
+
+    with tempfile.TemporaryFile() as archive_file:
+        archive_file.write(archive)
+        archive_file.seek(0)
+        with tarfile.open(fileobj=archive_file) as tar:
+            tar.extractall(output_dir)
+
+    return os.path.join(output_dir, 'python')
+
+
+def run_benchmark(commands, baseline=None, repeat=10):
+    """Time each command against the working tree (and optionally a baseline ref)."""
+    targets = {'current': os.path.join(REPO_ROOT, 'python')}
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        if baseline:
+            targets = {baseline: export_baseline(baseline, baseline_dir), **targets}
+
+        return [{'command': command,
+                 **{label: time_command(path, command, repeat) for label, path in targets.items()}}
+                for command in commands], list(targets)
+
+
+def print_table(results, labels):
+    """Print median cold start times (ms) per command and target."""
+    print(f"{'command':<24}" + ''.join(f'{label:>14}' for label in labels))
+    for result in results:
+        print(f"{result['command']:<24}" +
+              ''.join(f"{result[label] * 1000:>11.1f} ms" for label in labels))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark cocopack CLI cold start time.')
+    parser.add_argument('--commands', nargs='+', default=['--help', 'color-wrap RED hi'],
+                        help='CLI invocations to time.')
+    parser.add_argument('--baseline', default=None,
+                        help='Git ref to compare against. (default: none)')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Cold starts per invocation. (default: 10)')
+
+    args = parser.parse_args()
+
+    print_table(*run_benchmark(args.commands, args.baseline, args.repeat))
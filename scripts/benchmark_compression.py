@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tar_files compression backends on a project tree.
+
+Archives the same directory with each compression format supported by
+cocopack.pacman.tar_files and prints a table of wall time, throughput,
+and compression ratio. Each format is also checked with a tar_snapshot ->
+restore_snapshot round trip (restored files must match the source), and
+the script exits non-zero if any round trip fails. Each archive is
+also read back with tarfile in 'r:*' and 'r|*' mode: the block-parallel
+formats (pgz, pbz2, pxz) write multi-stream files, which 'r|*' can't read
+past the first block (tarfile can't read zst archives at all before
+Python 3.14; those columns show '-').
+
+Usage:
+    python benchmark_compression.py PROJECT_DIR [--formats gz pgz ...] [--workers N]
+
+Options:
+    --formats   Compression formats to compare (default: all available)
+    --workers   Threads for the parallel formats (default: all cores)
+    --keep      Keep the benchmark archives instead of deleting them
+"""
+
+import os
+import sys
+import time
+import filecmp
+import shutil
+import tarfile
+import tempfile
+import argparse
+
+from cocopack.pacman import (tar_files, tar_snapshot, restore_snapshot,
+                             iter_matching_files, COMPRESSION_BACKENDS)
+
+
+def get_tree_size(source):
+    """Total size (bytes) of the non-hidden files archived from source."""
+    files = tar_files(source, os.path.join(tempfile.gettempdir(), 'dry_run'), dry_run=True)
+    return sum(os.path.getsize(file_path) for file_path in files), len(files)
+
+
+def check_snapshot_roundtrip(source, fmt, workers=None):
+    """Snapshot source with fmt, restore it, and check every file matches."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        filename = os.path.join(output_dir, f'roundtrip_{fmt}')
+        restore_dir = os.path.join(output_dir, 'restored')
+
+        tar_snapshot(source, filename, fmt=fmt, workers=workers)
+        try:
+            restore_snapshot(filename, restore_dir)
+        except (tarfile.TarError, EOFError, OSError) as error:
+            print(f"Restoring {fmt} failed: {error!r}")
+            return False
+
+        for file_path in iter_matching_files(source):
+            restored_path = os.path.join(restore_dir, os.path.relpath(file_path, source))
+            if not os.path.isfile(restored_path) or \
+                    not filecmp.cmp(file_path, restored_path, shallow=False):
+                return False
+
+    return True
+
+
+def check_archive_readable(archive_path, mode, file_count):
+    """True if tarfile reads all file_count members of archive_path in mode."""
+    try:
+        with tarfile.open(archive_path, mode) as tar:
+            return sum(1 for member in tar if member.isfile()) == file_count
+    except (tarfile.TarError, EOFError, OSError):
+        return False
+
+
+def run_benchmark(source, formats, workers=None, keep=False):
+    """Archive source once per format and collect timing + size results."""
+    total_bytes, file_count = get_tree_size(source)
+    print(f"Benchmarking {file_count} files ({total_bytes / 1024 ** 2:.1f} MB) from {source}\n")
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for fmt in formats:
+            filename = os.path.join(output_dir, f'benchmark_{fmt}')
+            start_time = time.perf_counter()
+            try:
+                tar_files(source, filename, fmt=fmt, dry_run=False, workers=workers)
+            except ImportError as error:
+                print(f"Skipping {fmt}: {error}")
+                continue
+            elapsed = time.perf_counter() - start_time
+
+            output_file = f"{filename}.tar.{COMPRESSION_BACKENDS[fmt]['ext']}"
+            archive_bytes = os.path.getsize(output_file)
+            readable = {mode: check_archive_readable(output_file, mode, file_count)
+                        if fmt != 'zst' else None for mode in ['r:*', 'r|*']}
+            results.append({'readable': readable, 'fmt': fmt, 'seconds': elapsed,
+                            'throughput': total_bytes / 1024 ** 2 / elapsed,
+                            'ratio': total_bytes / max(archive_bytes, 1),
+                            'archive_mb': archive_bytes / 1024 ** 2,
+                            'restore_ok': check_snapshot_roundtrip(source, fmt, workers)})
+
+            if keep:
+                shutil.move(output_file, os.path.basename(output_file))
+
+    return results
+
+
+def print_table(results):
+    """Print benchmark results as a fixed-width table."""
+    print(f"\n{'format':<8}{'seconds':>10}{'MB/s':>10}{'ratio':>8}{'size (MB)':>12}"
+          f"{'restore':>9}{'r:*':>5}{'r|*':>5}")
+    for result in results:
+        print(f"{result['fmt']:<8}{result['seconds']:>10.2f}{result['throughput']:>10.1f}"
+              f"{result['ratio']:>8.2f}{result['archive_mb']:>12.1f}"
+              f"{'ok' if result['restore_ok'] else 'FAIL':>9}" +
+              ''.join(f"{ {True: 'ok', False: 'no', None: '-'}[readable]:>5}"
+                      for readable in result['readable'].values()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark tar_files compression backends.')
+    parser.add_argument('source', help='Project directory to archive.')
+    parser.add_argument('--formats', nargs='+', default=list(COMPRESSION_BACKENDS.keys()),
+                        help='Compression formats to compare. (default: all)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Threads for the parallel formats. (default: all cores)')
+    parser.add_argument('--keep', action='store_true',
+                        help='Keep the benchmark archives in the current directory.')
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.source, args.formats, args.workers, args.keep)
+    print_table(results)
+
+    failures = [result for result in results if not result['restore_ok']
+                or result['readable']['r:*'] is False]
+    sys.exit(1 if failures else 0)
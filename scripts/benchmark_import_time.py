@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import time of cocopack with `python -X importtime`.
+
+Imports each target module in a fresh interpreter (several times, keeping
+the fastest run), prints the cumulative import time and the slowest
+dependencies, and fails if a time budget is exceeded or if any of the
+heavy modules (IPython, PIL, ...) were pulled in by a bare import.
+
+Usage:
+    python benchmark_import_time.py [--modules cocopack ...] [--budget MS]
+
+Options:
+    --modules   Modules to import (default: cocopack)
+    --repeat    Number of fresh interpreters per module (default: 5)
+    --budget    Maximum cumulative import time in milliseconds (default: 150)
+    --top       Number of slowest dependencies to show (default: 10)
+"""
+
+import re
+import sys
+import argparse
+import subprocess
+
+HEAVY_MODULES = ['IPython', 'PIL', 'tqdm', 'numpy', 'pandas', 'matplotlib']
+
+IMPORTTIME_REGEX = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module):
+    """Import module in a fresh interpreter; return ({name: cumulative_us}, loaded heavy modules)."""
+    check = f"import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}; {check}'],
+                            capture_output=True, text=True, check=True)
+
+    timings = {}
+    for match in IMPORTTIME_REGEX.finditer(result.stderr):
+        timings[match.group(4)] = int(match.group(2))
+
+    heavy = [name for name in result.stdout.strip().split(',') if name]
+    return timings, heavy
+
+
+def run_benchmark(modules, repeat=5):
+    """Measure each module repeat times, keeping the fastest run."""
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        timings, heavy = min(runs, key=lambda run: run[0].get(module, 0))
+        results.append({'module': module, 'total_ms': timings.get(module, 0) / 1000,
+                        'timings': timings, 'heavy': heavy})
+
+    return results
+
+
+def print_report(results, top=10):
+    """Print cumulative import times and the slowest dependencies."""
+    for result in results:
+        print(f"{result['module']}: {result['total_ms']:.1f} ms cumulative")
+        print(f"  heavy modules loaded: {', '.join(result['heavy']) or 'none'}")
+
+        slowest = sorted([item for item in result['timings'].items()
+                          if item[0] != result['module']], key=lambda item: -item[1])
+        for name, micros in slowest[:top]:
+            print(f"  {micros / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark cocopack import time.')
+    parser.add_argument('--modules', nargs='+', default=['cocopack'],
+                        help='Modules to import. (default: cocopack)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Fresh interpreters per module. (default: 5)')
+    parser.add_argument('--budget', type=float, default=150,
+                        help='Maximum cumulative import time in ms. (default: 150)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of slowest dependencies to show. (default: 10)')
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.repeat)
+    print_report(results, args.top)
+
+    failures = [result for result in results
+                if result['total_ms'] > args.budget or result['heavy']]
+
+    for result in failures:
+        print(f"\nFAIL: import {result['module']} took {result['total_ms']:.1f} ms "
+              f"(budget {args.budget:.0f} ms); heavy modules: {result['heavy'] or 'none'}")
+
+    sys.exit(1 if failures else 0)
@@ -176,7 +176,8 @@ saferm() {
 
 # function to split PATH into an array
 split_path() {
-    if (IFS=':' read -r -a path_array <<< "$PATH") 2>/dev/null; then :
+    if (IFS=':' read -r -a path_array <<< "$PATH") 2>/dev/null; then
+        IFS=':' read -r -a path_array <<< "$PATH"
     elif [ -n "$ZSH_VERSION" ]; then
         IFS=':' read -r -A path_array <<< "$PATH"
     else
@@ -259,56 +260,59 @@ path_cleanup() {
     local removed_duplicates=()
     local removed_empties=()
     local removed_missing=()
-    local updated_path_array=()
 
-    # Remove duplicate entries:
+    # Remove duplicate entries: one pass with an associative array as the set
+    # (over a reversed copy for --keep-last-entry, reversed back at the end);
+    # keys are prefixed with '_', since bash rejects empty subscripts.
+    # Arrays are only expanded whole, since bash indexes from 0 and zsh from 1
+    local updated_path_array=("${path_array[@]}")
     if $remove_duplicates; then
         local unique_paths=()
-        local seen=()
+        local -A seen=()
+        local search_paths=() entry
         if $keep_first_entry; then
+            search_paths=("${path_array[@]}")
+        else
             for entry in "${path_array[@]}"; do
-                if [[ ! " ${seen[*]} " =~ " $entry " ]] \
-                && ! should_ignore "$entry"; then
-                    unique_paths+=("$entry")
-                    seen+=("$entry")
-                elif should_ignore "$entry"; then
-                    unique_paths+=("$entry")
-                else
-                    removed_duplicates+=("$entry")
-                fi
+                search_paths=("$entry" "${search_paths[@]}")
             done
+        fi
+        for entry in "${search_paths[@]}"; do
+            if should_ignore "$entry"; then
+                unique_paths+=("$entry")
+            elif [[ -z ${seen["_$entry"]+x} ]]; then
+                unique_paths+=("$entry")
+                seen["_$entry"]=1
+            else
+                removed_duplicates+=("$entry")
+            fi
+        done
+        if $keep_first_entry; then
+            updated_path_array=("${unique_paths[@]}")
         else
-            for ((i=${#path_array[@]}-1; i>=0; i--)); do
-                entry="${path_array[i]}"
-                if [[ ! " ${seen[*]} " =~ " $entry " ]] \
-                && ! should_ignore "$entry"; then
-                    unique_paths=("$entry" "${unique_paths[@]}")
-                    seen+=("$entry")
-                elif should_ignore "$entry"; then
-                    unique_paths=("$entry" "${unique_paths[@]}")
-                else
-                    removed_duplicates+=("$entry")
-                fi
+            updated_path_array=()
+            for entry in "${unique_paths[@]}"; do
+                updated_path_array=("$entry" "${updated_path_array[@]}")
             done
         fi
-        updated_path_array=("${unique_paths[@]}")
     fi
 
     # Filter out empty + missing, if not ignored
+    local kept_paths=()
     for entry in "${updated_path_array[@]}"; do
         if $remove_empties && [ -z "$entry" ] \
         && ! should_ignore "$entry"; then
             removed_empties+=("$entry")
-        elif $remove_missing && [ ! -d "$entry" ] \
+        elif $remove_missing && [ -n "$entry" ] && [ ! -d "$entry" ] \
         && ! should_ignore "$entry"; then
             removed_missing+=("$entry")
         else
-            path_array+=("$entry")
+            kept_paths+=("$entry")
         fi
     done
 
     if ! $dry_run; then
-        path_array=("${updated_path_array[@]}")
+        path_array=("${kept_paths[@]}")
     fi
 
     # Print removal reports if in verbose or dry_run mode
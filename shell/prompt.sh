@@ -60,6 +60,12 @@ path_tags=(
 )
 
 function abridge_path {
+    _abridge_path "$@"
+    echo "$REPLY"
+}
+
+# as abridge_path, but sets REPLY instead of echoing (no subshell needed)
+function _abridge_path {
     local cur_path="${1:-$PWD}"
     local num_dirs="${2:-3}"  
     local by_part="${3:-false}" 
@@ -111,10 +117,16 @@ function abridge_path {
     # Remove leading slash added for processing
     display_path="${display_path:1}"
 
-    echo "$display_path"
+    REPLY="$display_path"
 }
 
 function custom_path {
+    _custom_path "$@"
+    echo "$REPLY"
+}
+
+# as custom_path, but sets REPLY instead of echoing (no subshell needed)
+function _custom_path {
     local cur_path="$PWD"
     local tagged_path=""
     local shorten_path=${1:-0}
@@ -144,11 +156,12 @@ function custom_path {
         local tag="%F{$tag_color}•••%f"
         if [[ $shorten_path -eq 1 ]]; then
             #cur_path="${path_parts[1]}/${path_parts[2]}/${tag}/${path_parts[-1]}"
-            cur_path=$(abridge_path "$cur_path" 3 true, "$tag_color")
+            _abridge_path "$cur_path" 3 true, "$tag_color"
+            cur_path="$REPLY"
         fi
     fi
 
-    echo "$cur_path"
+    REPLY="$cur_path"
 }
 
 function find_environment {
@@ -166,17 +179,23 @@ function find_environment {
 }
 
 function get_env_prompt {
-    local parentheses=${1:-false}
-    local use_color="${2:-blue}"
-    local with_emoji=${3:-false}
+    _format_env_prompt "$(find_environment)" "$@"
+    echo "$REPLY" # for use in prompt
+}
+
+# format the output of find_environment ("type:name") as get_env_prompt, into REPLY
+function _format_env_prompt {
+    local env_output="$1"
+    local parentheses=${2:-false}
+    local use_color="${3:-blue}"
+    local with_emoji=${4:-false}
     
-    local env_output=$(find_environment)
     local env_type="${env_output%%:*}"
     local env_name="${env_output#*:}"
 
     # No environment found, return empty string
     if [[ -z "$env_type" ]]; then
-        echo ""
+        REPLY=""
         return
     fi
 
@@ -208,7 +227,7 @@ function get_env_prompt {
         formatted_env="($formatted_env)"
     fi
 
-    echo "$formatted_env" # for use in prompt
+    REPLY="$formatted_env"
 }
 
 trim_end() {
@@ -250,24 +269,297 @@ function conda_prompt {
 }
 
 function git_prompt {
-    local tag_color="$1"
-    local add_wrap="${2:-true}"
+    _format_git_prompt "$(parse_git_branch)" "$@"
+    [[ -n "$REPLY" ]] && echo "$REPLY"
+}
 
-    local GIT_BRANCH=$(parse_git_branch)
-    local GIT_SYMBOL=$(define_prompt_symbol "$tag_symbol")
+# format a branch name as git_prompt, into REPLY
+function _format_git_prompt {
+    local GIT_BRANCH="$1"
+    local tag_color="$2"
+    local add_wrap="${3:-true}"
 
+    REPLY=""
     if [[ -n "$GIT_BRANCH" ]]; then
         if [[ "$add_wrap" == true ]]; then
             GIT_BRANCH="git:($GIT_BRANCH)"
         fi
         
         if [[ -n "$tag_color" ]]; then
-            echo "%F{$tag_color}$GIT_BRANCH%f"
+            REPLY="%F{$tag_color}$GIT_BRANCH%f"
         else
-            echo "$GIT_BRANCH"
+            REPLY="$GIT_BRANCH"
+        fi
+    fi
+}
+
+# >>> Fast prompt mode >>>
+# Segments are computed once per prompt by a precmd hook, without forking
+# (no git / pyenv / rbenv calls, no command substitutions), and stored in
+# PROMPT_GIT, PROMPT_ENV and PROMPT_PATH for use in the prompt:
+#   enable_fast_prompt green blue
+#   PROMPT='$PROMPT_ENV %F{cyan}%n@%m%f $PROMPT_PATH $PROMPT_GIT %# '
+
+typeset -gA _prompt_git_heads    # directory -> HEAD file of its repository
+typeset -gA _prompt_git_branches # HEAD file -> "mtime:branch"
+
+# find the HEAD file of the repository containing $1 (default: $PWD), into REPLY
+function _find_git_head {
+    local dir="${1:-$PWD}"
+    local start_dir="$dir"
+    local line
+
+    REPLY="${_prompt_git_heads[$start_dir]}"
+    [[ -n "$REPLY" && -f "$REPLY" ]] && return 0
+
+    REPLY=""
+    while [[ -n "$dir" ]]; do
+        if [[ -d "$dir/.git" ]]; then
+            REPLY="$dir/.git/HEAD"
+        elif [[ -f "$dir/.git" ]]; then # worktree / submodule: "gitdir: <path>"
+            read -r line < "$dir/.git"
+            line="${line#gitdir: }"
+            [[ "$line" != /* ]] && line="$dir/$line"
+            REPLY="$line/HEAD"
+        fi
+
+        if [[ -n "$REPLY" ]]; then
+            _prompt_git_heads[$start_dir]="$REPLY"
+            return 0
+        fi
+        dir="${dir%/*}"
+    done
+    return 1
+}
+
+# current branch (as parse_git_branch) read from .git/HEAD, into REPLY
+function _read_git_branch {
+    local head_file mtime line cached
+
+    _find_git_head || { REPLY=""; return 1; }
+    head_file="$REPLY"
+
+    # cache by HEAD mtime, where it can be read without forking (zsh/stat)
+    mtime=""
+    if [[ -n "$ZSH_VERSION" ]] && zmodload -F zsh/stat b:zstat 2>/dev/null; then
+        zstat -A mtime +mtime -- "$head_file" 2>/dev/null
+        cached="${_prompt_git_branches[$head_file]}"
+        if [[ -n "$cached" && "${cached%%:*}" == "$mtime" ]]; then
+            REPLY="${cached#*:}"
+            return 0
         fi
     fi
+
+    read -r line < "$head_file"
+    if [[ -z "$line" ]]; then
+        REPLY=""; return 1
+    elif [[ "$line" == "ref: refs/heads/"* ]]; then
+        REPLY="${line#ref: refs/heads/}"
+    else # detached HEAD
+        REPLY="(HEAD detached at ${line:0:7})"
+    fi
+
+    [[ -n "$mtime" ]] && _prompt_git_branches[$head_file]="$mtime:$REPLY"
+    return 0
+}
+
+# read the first line of the nearest version file named $1 (walking up from $PWD), into REPLY
+function _find_version_file {
+    local dir="$PWD"
+    REPLY=""
+    while [[ -n "$dir" ]]; do
+        if [[ -f "$dir/$1" ]]; then
+            read -r REPLY < "$dir/$1"
+            return 0
+        fi
+        dir="${dir%/*}"
+    done
+    return 1
+}
+
+# find_environment, without running pyenv / rbenv (reads their version files), into REPLY
+function _find_environment {
+    REPLY=""
+    if [[ -n "$CONDA_DEFAULT_ENV" ]]; then
+        REPLY="conda:$CONDA_DEFAULT_ENV"
+    elif [[ -n "$NVM_DIR" ]]; then
+        REPLY="nvm:$NVM_DIR"
+    elif command -v pyenv >/dev/null 2>&1; then
+        local pyenv_version="$PYENV_VERSION"
+        if [[ -z "$pyenv_version" ]]; then
+            if _find_version_file .python-version; then
+                pyenv_version="$REPLY"
+            elif [[ -f "${PYENV_ROOT:-$HOME/.pyenv}/version" ]]; then
+                read -r pyenv_version < "${PYENV_ROOT:-$HOME/.pyenv}/version"
+            fi
+        fi
+        REPLY="pyenv:${pyenv_version:-system}"
+    elif command -v rbenv >/dev/null 2>&1; then
+        local rbenv_version=""
+        [[ -f "${RBENV_ROOT:-$HOME/.rbenv}/version" ]] && \
+            read -r rbenv_version < "${RBENV_ROOT:-$HOME/.rbenv}/version"
+        REPLY="rbenv:${rbenv_version:-system}"
+    fi
+}
+
+# precmd hook: update PROMPT_GIT, PROMPT_ENV and PROMPT_PATH
+function prompt_segments_update {
+    _read_git_branch
+    _prompt_git_branch="$REPLY"
+    _format_git_prompt "$REPLY" "$_prompt_git_color"
+    PROMPT_GIT="$REPLY"
+
+    _find_environment
+    _format_env_prompt "$REPLY" false "$_prompt_env_color"
+    PROMPT_ENV="$REPLY"
+
+    _custom_path "$_prompt_path_color"
+    PROMPT_PATH="$REPLY"
+}
+
+# enable fast prompt mode: enable_fast_prompt [git_color] [env_color] [path_color]
+function enable_fast_prompt {
+    _prompt_git_color="${1:-green}"
+    _prompt_env_color="${2:-blue}"
+    _prompt_path_color="${3:-blue}"
+
+    setopt prompt_subst
+    autoload -Uz add-zsh-hook
+    add-zsh-hook precmd prompt_segments_update
+    prompt_segments_update
+}
+
+function prompt_cache_clear {
+    _prompt_git_heads=()
+    _prompt_git_branches=()
+    _prompt_async_cache=()
+}
+
+# report the average render cost (ms) of each segment: prompt_timing [iterations]
+function prompt_timing {
+    local iterations="${1:-100}"
+    local segment i start
+
+    zmodload zsh/datetime
+    for segment in 'git_prompt green' '_read_git_branch' \
+                   'get_env_prompt false blue' '_find_environment' \
+                   'custom_path blue' '_custom_path blue'; do
+        start=$EPOCHREALTIME
+        for (( i=0; i<iterations; i++ )); do
+            if [[ "$segment" == _* ]]; then
+                ${=segment} >/dev/null
+            else # original segments render through a command substitution
+                REPLY="$(${=segment})"
+            fi
+        done
+        printf '%-28s %8.3f ms\n' "$segment" $(( (EPOCHREALTIME - start) * 1000 / iterations ))
+    done
+}
+# <<< Fast prompt mode <<<
+
+# >>> Async prompt mode >>>
+# As the fast mode, plus slow probes (git dirty state, the real pyenv / rbenv
+# environment) computed in a background job: the prompt shows the last known
+# value for the directory meanwhile, and is redrawn when the job is done.
+#   enable_async_prompt green blue   (disable_async_prompt to switch back)
+
+typeset -gA _prompt_async_cache # "segment:directory" -> last known value
+typeset -g _prompt_async_pid=0
+typeset -g _prompt_async_file="${TMPDIR:-/tmp}/cocopack-prompt-$$"
+
+# background job: write "key=value" lines for the slow segments, then signal the shell
+function _prompt_async_job {
+    local in_repo="$1"
+    local dirty=""
+
+    if [[ -n "$in_repo" ]] && \
+        [[ -n "$(git status --porcelain --ignore-submodules 2>/dev/null | head -n 1)" ]]; then
+        dirty="*"
+    fi
+
+    {
+        print -r -- "dir=$PWD"
+        print -r -- "dirty=$dirty"
+        print -r -- "env=$(find_environment)"
+    } >| "$_prompt_async_file.$sysparams[pid]"
+    mv -f "$_prompt_async_file.$sysparams[pid]" "$_prompt_async_file"
+
+    kill -USR1 $$ # $$ is the parent shell, even in the background job
+}
+
+# render the slow segments from their last known values for $PWD
+function _prompt_async_render {
+    local dirty="${_prompt_async_cache[dirty:$PWD]}"
+
+    if [[ -n "$_prompt_git_branch" ]]; then
+        _format_git_prompt "$_prompt_git_branch$dirty" "$_prompt_git_color"
+        PROMPT_GIT="$REPLY"
+    fi
+
+    if [[ -n "${_prompt_async_cache[env:$PWD]+x}" ]]; then
+        _format_env_prompt "${_prompt_async_cache[env:$PWD]}" false "$_prompt_env_color"
+        PROMPT_ENV="$REPLY"
+    fi
+}
+
+# the background job is done (USR1): cache its results and redraw the prompt
+function _prompt_async_done {
+    local line key dir=""
+
+    [[ -f "$_prompt_async_file" ]] || return 0
+    while read -r line; do
+        key="${line%%=*}"
+        case "$key" in
+            dir) dir="${line#*=}" ;;
+            *) _prompt_async_cache[${key}:${dir}]="${line#*=}" ;;
+        esac
+    done < "$_prompt_async_file"
+    rm -f "$_prompt_async_file"
+    _prompt_async_pid=0
+
+    # results for an old directory are kept, but don't change this prompt
+    [[ "$dir" == "$PWD" ]] || return 0
+    _prompt_async_render
+    zle && zle reset-prompt
+}
+
+# precmd hook: fast segments now, slow segments in the background
+function prompt_async_update {
+    prompt_segments_update
+    _prompt_async_render
+
+    # only the latest job matters
+    (( _prompt_async_pid > 0 )) && kill -s HUP $_prompt_async_pid 2>/dev/null
+    _prompt_async_job "$_prompt_git_branch" &!
+    _prompt_async_pid=$!
+}
+
+# enable async prompt mode: enable_async_prompt [git_color] [env_color] [path_color]
+function enable_async_prompt {
+    enable_fast_prompt "$@"
+    zmodload zsh/system # for $sysparams
+
+    trap '_prompt_async_done' USR1
+    add-zsh-hook -d precmd prompt_segments_update
+    add-zsh-hook precmd prompt_async_update
+    add-zsh-hook zshexit _prompt_async_cleanup
+}
+
+# back to the (synchronous) fast prompt mode
+function disable_async_prompt {
+    add-zsh-hook -d precmd prompt_async_update
+    add-zsh-hook -d zshexit _prompt_async_cleanup
+    add-zsh-hook precmd prompt_segments_update
+    _prompt_async_cleanup
+    trap - USR1
+}
+
+function _prompt_async_cleanup {
+    (( _prompt_async_pid > 0 )) && kill -s HUP $_prompt_async_pid 2>/dev/null
+    _prompt_async_pid=0
+    rm -f "$_prompt_async_file"*
 }
+# <<< Async prompt mode <<<
 
 # Example prompt specification:
 #PROMPT='$(conda_prompt green) %F{cyan}%n@%m%f $(custom_path) %# '
\ No newline at end of file